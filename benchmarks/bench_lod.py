@@ -0,0 +1,67 @@
+"""
+Texel density area timings (lod_utils._areas_python vs. _areas_numpy) on a synthetic quad grid with
+triangles mixed in, built directly as raw point / polygon / UVW buffers. Runs outside Cinema 4D:
+python benchmarks/bench_lod.py [polygons] [repeats]
+"""
+import array
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "mw_utils"))
+
+# lod_utils / mw_utils import c4d/maxon at module level; only the buffer math is exercised here
+# (constants read at import time, e.g. default arguments, resolve to 0)
+for _name in ("c4d", "maxon"):
+    _stub = sys.modules.setdefault(_name, types.ModuleType(_name))
+    _stub.__getattr__ = lambda attr: 0
+
+import lod_utils
+
+def make_grid(polygons):
+    """Square grid of about `polygons` faces (every 7th one a triangle) as Vector / CPolygon / UVW buffers."""
+    side = max(1, int(polygons ** 0.5))
+    points = array.array("d")
+    for y in range(side + 1):
+        for x in range(side + 1):
+            points.extend((x * 2.0, (x * y) % 3 * 0.5, y * 2.0))
+    polys = array.array("i")
+    uvs = array.array("d")
+    for y in range(side):
+        for x in range(side):
+            a = y * (side + 1) + x
+            b, c, d = a + 1, a + side + 2, a + side + 1
+            if (x + y) % 7 == 0:
+                d = c
+            polys.extend((a, b, c, d))
+            u, v = x / side, y / side
+            step = 1.0 / side
+            uvs.extend((u, v, 0.0, u + step, v, 0.0, u + step, v + step, 0.0, u, v + step, 0.0))
+    return points, polys, uvs, ("d", "d")
+
+def timed(func, args, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main():
+    polygons = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    matrix = ((10.0, 0.0, 5.0), (1.0, 0.0, 0.0), (0.0, 0.8, 0.6), (0.0, -0.6, 0.8))
+    buffers = make_grid(polygons)
+
+    args = buffers + (matrix,)
+    python_time, python_result = timed(lod_utils._areas_python, args, repeats)
+    print(f"{len(buffers[1]) // 4} polygons")
+    print(f"  _areas_python {python_time * 1000:10.1f} ms  world {python_result[0]:.3f}  uv {python_result[1]:.6f}")
+    if lod_utils.np is not None:
+        numpy_time, numpy_result = timed(lod_utils._areas_numpy, args, repeats)
+        print(f"  _areas_numpy  {numpy_time * 1000:10.1f} ms  world {numpy_result[0]:.3f}  uv {numpy_result[1]:.6f}")
+
+if __name__ == "__main__":
+    main()
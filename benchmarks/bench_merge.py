@@ -0,0 +1,153 @@
+"""
+MergeObjects (buffer merge) vs. the deprecated Join-based GetMergedObject at 1k / 10k / 100k input objects.
+In Cinema 4D (Script Manager or c4dpy benchmarks/bench_merge.py [counts...]) both are timed on real cubes built in
+a separate, non-active document; the active document is never touched.
+Outside Cinema 4D (python benchmarks/bench_merge.py [counts...]) a stub object model with raw tag buffers stands in,
+so only MergeObjects is timed (the Join modeling command needs Cinema 4D).
+"""
+import array
+import os
+import sys
+import time
+import types
+
+try:
+    import c4d
+except ImportError:
+    c4d = None
+
+try:
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+except NameError: # Script Manager
+    ROOT = os.path.dirname(os.path.dirname(os.path.abspath(sys.argv[0] if sys.argv and sys.argv[0] else ".")))
+sys.path.insert(0, os.path.join(ROOT, "mw_utils"))
+
+CUBE_FACES = [(0, 1, 3, 2), (4, 6, 7, 5), (0, 4, 5, 1), (2, 3, 7, 6), (0, 2, 6, 4), (1, 5, 7, 3)]
+CUBE_UVS = (0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0)
+
+def cube_position(index):
+    return (index % 100 * 20.0, (index // 100) % 100 * 20.0, index // 10000 * 20.0)
+
+# --- Stub object model (outside Cinema 4D) ---
+
+class StubVector:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x=0.0, y=0.0, z=0.0): self.x, self.y, self.z = x, y, z
+
+class StubMatrix:
+    def __init__(self, off=(0.0, 0.0, 0.0)):
+        self.off = StubVector(*off)
+        self.v1, self.v2, self.v3 = StubVector(1.0), StubVector(0.0, 1.0), StubVector(0.0, 0.0, 1.0)
+
+class StubTag:
+    def __init__(self, tag_type, nbytes):
+        self.type, self.data = tag_type, bytearray(nbytes)
+
+    def GetType(self): return self.type
+    def GetLowlevelDataAddressR(self): return self.data
+    def GetLowlevelDataAddressW(self): return self.data
+
+class StubPolygonObject:
+    """PolygonObject stand-in: point / polygon tags as raw Vector (double) / CPolygon (int32) buffers."""
+    _guid = 0
+
+    def __init__(self, point_count, poly_count):
+        StubPolygonObject._guid += 1
+        self.guid, self.name, self.mg = StubPolygonObject._guid, "", StubMatrix()
+        self.point_count, self.poly_count = point_count, poly_count
+        self.tags = {c4d.Tpoint: StubTag(c4d.Tpoint, point_count * 24), c4d.Tpolygon: StubTag(c4d.Tpolygon, poly_count * 16)}
+
+    def GetPointCount(self): return self.point_count
+    def GetPolygonCount(self): return self.poly_count
+    def GetTag(self, tag_type): return self.tags.get(tag_type)
+    def InsertTag(self, tag): self.tags[tag.type] = tag
+    def GetMg(self): return self.mg
+    def GetGUID(self): return self.guid
+    def GetDocument(self): return None
+    def SetName(self, name): self.name = name
+    def Message(self, message): return True
+    def GetDeformCache(self): return None
+    def GetCache(self): return None
+    def GetCacheParent(self): return None
+    def GetDown(self): return None
+    def GetNext(self): return None
+    def GetDirty(self, flags): return 0
+    def GetBit(self, bit): return False
+    def IsInstanceOf(self, type_id): return type_id == c4d.Opolygon
+
+def install_stub_c4d():
+    module = types.ModuleType("c4d")
+    module.Tpoint, module.Tpolygon, module.Tuvw, module.Opolygon = 5600, 5604, 5671, 5100
+    module.PolygonObject = StubPolygonObject
+    module.UVWTag = lambda poly_count: StubTag(module.Tuvw, poly_count * 96)
+    module.__getattr__ = lambda attr: 0 # remaining constants (dirty flags, bits, default arguments)
+    sys.modules["c4d"] = module
+    sys.modules.setdefault("maxon", types.ModuleType("maxon"))
+    return module
+
+def make_stub_cube(index):
+    cube = StubPolygonObject(8, 6)
+    points = array.array("d", [c * 10.0 for i in range(8) for c in (i & 1, (i >> 1) & 1, (i >> 2) & 1)])
+    cube.tags[c4d.Tpoint].data[:] = points.tobytes()
+    cube.tags[c4d.Tpolygon].data[:] = array.array("i", [i for face in CUBE_FACES for i in face]).tobytes()
+    uvw = StubTag(c4d.Tuvw, 6 * 96)
+    uvw.data[:] = array.array("d", CUBE_UVS * 6).tobytes()
+    cube.InsertTag(uvw)
+    cube.mg = StubMatrix(cube_position(index))
+    return cube
+
+# --- Cinema 4D ---
+
+def make_cube(index):
+    """Six-quad box with a UVW tag, offset so every object has its own global matrix."""
+    cube = c4d.PolygonObject(8, 6)
+    for i in range(8):
+        cube.SetPoint(i, c4d.Vector(i & 1, (i >> 1) & 1, (i >> 2) & 1) * 10.0)
+    uvw = c4d.UVWTag(6)
+    for p, face in enumerate(CUBE_FACES):
+        cube.SetPolygon(p, c4d.CPolygon(*face))
+        uvw.SetSlow(p, c4d.Vector(0, 0, 0), c4d.Vector(1, 0, 0), c4d.Vector(1, 1, 0), c4d.Vector(0, 1, 0))
+    cube.InsertTag(uvw)
+    cube.SetRelPos(c4d.Vector(*cube_position(index)))
+    cube.Message(c4d.MSG_UPDATE)
+    return cube
+
+def main():
+    global c4d
+    counts = [int(arg) for arg in sys.argv[1:] if arg.isdigit()] or [1000, 10000, 100000]
+    stub = c4d is None
+    if stub:
+        c4d = install_stub_c4d()
+    import mw_utils
+
+    for count in counts:
+        if stub:
+            objects = [make_stub_cube(i) for i in range(count)]
+            start = time.perf_counter()
+            merged = mw_utils.MergeObjects(objects)
+            fast = time.perf_counter() - start
+            print(f"{count:7} objects  MergeObjects {fast * 1000:10.1f} ms  (stub objects, numpy "
+                  f"{'on' if mw_utils.np is not None else 'off'})  points {merged.GetPointCount()}")
+            continue
+
+        doc = c4d.documents.BaseDocument()
+        objects = [make_cube(i) for i in range(count)]
+        for obj in reversed(objects):
+            doc.InsertObject(obj)
+        doc.ExecutePasses(None, False, False, True, c4d.BUILDFLAGS_NONE)
+
+        start = time.perf_counter()
+        merged = mw_utils.MergeObjects(objects)
+        fast = time.perf_counter() - start
+
+        start = time.perf_counter()
+        joined = mw_utils.GetMergedObject(None, objects, doc)
+        join = time.perf_counter() - start
+
+        print(f"{count:7} objects  MergeObjects {fast * 1000:10.1f} ms  Join {join * 1000:10.1f} ms  "
+              f"x{join / max(fast, 1e-9):.1f}  points {merged.GetPointCount()} / {joined.GetPointCount()}")
+        doc.Flush()
+
+if __name__ == "__main__":
+    main()
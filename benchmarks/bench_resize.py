@@ -0,0 +1,62 @@
+"""
+Resize mode timings (plain LANCZOS vs. linear light / normal / height) on synthetic maps.
+Runs outside Cinema 4D: python benchmarks/bench_resize.py [size] [repeats]
+"""
+import os
+import sys
+import time
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "mw_utils"))
+
+from PIL import Image
+
+import image_utils
+
+def make_images(size):
+    noise = Image.effect_noise((size, size), 64)
+    color = Image.merge("RGB", [noise, noise.rotate(90), noise.transpose(Image.Transpose.FLIP_LEFT_RIGHT)])
+    normal = Image.merge("RGB", [noise.point(lambda v: 64 + v // 2), noise.rotate(90).point(lambda v: 64 + v // 2),
+                                 Image.new("L", (size, size), 230)])
+    height = noise.convert("I").point(lambda v: v * 257).convert("I;16")
+    return {"color": color, "normal": normal, "height": height}
+
+def bench(paths, mode, repeats):
+    best = None
+    for _ in range(repeats):
+        for src, dst in paths:
+            start = time.perf_counter()
+            image_utils.resize_and_strip_metadata(src, dst, mode)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {}
+        for name, img in make_images(size).items():
+            src = os.path.join(tmp, f"{name}.png")
+            img.save(src, compress_level=1)
+            paths[name] = [(src, os.path.join(tmp, f"{name}_Low.png"))]
+
+        print(f"{size}x{size}, best of {repeats} (decode + resize + PNG encode)")
+        cases = [
+            ("color", image_utils.RESIZE_MODE_DEFAULT),
+            ("color", image_utils.RESIZE_MODE_LINEAR),
+            ("normal", image_utils.RESIZE_MODE_DEFAULT),
+            ("normal", image_utils.RESIZE_MODE_NORMAL),
+            ("height", image_utils.RESIZE_MODE_DEFAULT),
+            ("height", image_utils.RESIZE_MODE_HEIGHT),
+        ]
+        baseline = {}
+        for name, mode in cases:
+            seconds = bench(paths[name], mode, repeats)
+            baseline.setdefault(name, seconds)
+            print(f"  {name:7} {mode:8} {seconds * 1000:8.1f} ms  x{seconds / baseline[name]:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Object hierarchy traversal timings (old recursive walk vs. explicit-stack generators) on synthetic
+deep and wide trees. Uses a stub object model so it runs outside Cinema 4D:
+python benchmarks/bench_traversal.py [nodes] [repeats]
+"""
+import os
+import sys
+import time
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "mw_utils"))
+
+# mw_utils imports c4d/maxon at module level; outside Cinema 4D only the traversal code is exercised
+# (constants read at import time, e.g. default arguments, resolve to 0)
+for _name in ("c4d", "maxon"):
+    _stub = sys.modules.setdefault(_name, types.ModuleType(_name))
+    _stub.__getattr__ = lambda attr: 0
+
+import mw_utils
+
+class StubObject:
+    """Minimal BaseObject stand-in: hierarchy links, type, layer and bits."""
+    __slots__ = ("type", "layer", "bits", "up", "down", "next")
+
+    def __init__(self, type_id=5100, layer=None, bits=0):
+        self.type, self.layer, self.bits = type_id, layer, bits
+        self.up = self.down = self.next = None
+
+    def GetUp(self): return self.up
+    def GetDown(self): return self.down
+    def GetNext(self): return self.next
+    def GetType(self): return self.type
+    def IsInstanceOf(self, type_id): return self.type == type_id
+    def GetLayerObject(self, doc): return self.layer
+    def GetBit(self, bit): return bool(self.bits & bit)
+
+class StubDocument:
+    def __init__(self, first): self.first = first
+    def GetFirstObject(self): return self.first
+
+def _link(parent, children):
+    prev = None
+    for child in children:
+        child.up = parent
+        if prev is None:
+            if parent is not None:
+                parent.down = child
+        else:
+            prev.next = child
+        prev = child
+    return children[0] if children else None
+
+def _make(i):
+    return StubObject(5100 if i % 3 else 5140, "layer_a" if i % 2 else None, 1 if i % 5 == 0 else 0)
+
+def make_deep(count):
+    """Single chain: every object is the only child of the previous one."""
+    nodes = [_make(i) for i in range(count)]
+    for parent, child in zip(nodes, nodes[1:]):
+        _link(parent, [child])
+    return StubDocument(nodes[0])
+
+def make_wide(count):
+    """Flat scene: one null holding every other object as a direct child."""
+    root = _make(0)
+    _link(root, [_make(i) for i in range(1, count)])
+    return StubDocument(root)
+
+def make_mixed(count, fanout=8):
+    """Balanced tree with a fixed fan-out (typical nulls-with-children scenes)."""
+    nodes = [_make(i) for i in range(count)]
+    for i in range(1, count, fanout):
+        _link(nodes[(i - 1) // fanout], nodes[i:i + fanout])
+    return StubDocument(nodes[0])
+
+# Previous recursive implementations, kept here as the baseline
+def recursive_all_objects(doc):
+    result = []
+    def _collect(obj):
+        while obj:
+            result.append(obj)
+            _collect(obj.GetDown())
+            obj = obj.GetNext()
+    _collect(doc.GetFirstObject())
+    return result
+
+def recursive_all_children(objects, parent=True):
+    result = []
+    for o in (objects if isinstance(objects, list) else [objects]):
+        if parent:
+            result.append(o)
+        for child in _children(o):
+            result.extend(recursive_all_children(child))
+    return result
+
+def _children(obj):
+    child = obj.GetDown()
+    while child:
+        yield child
+        child = child.GetNext()
+
+def timed(func, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        try:
+            func()
+        except RecursionError:
+            return None
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    print(f"{count} objects, best of {repeats}, recursion limit {sys.getrecursionlimit()}")
+
+    for name, make in (("deep", make_deep), ("wide", make_wide), ("mixed", make_mixed)):
+        doc = make(count)
+        root = doc.GetFirstObject()
+        if name != "deep":
+            assert recursive_all_objects(doc) == mw_utils.GetAllObjects(doc)
+            assert recursive_all_children(root, False) == mw_utils.GetAllChildren(root, False)
+        cases = [
+            ("GetAllObjects  recursive", lambda: recursive_all_objects(doc)),
+            ("GetAllObjects  stack", lambda: mw_utils.GetAllObjects(doc)),
+            ("GetAllChildren recursive", lambda: recursive_all_children(root)),
+            ("GetAllChildren stack", lambda: mw_utils.GetAllChildren(root)),
+            ("filter type+layer+bits", lambda: list(mw_utils.IterAllObjects(doc, types=5100, layer="layer_a", bits=1))),
+            ("first match (early stop)", lambda: next(mw_utils.IterAllObjects(doc, types=5140), None)),
+        ]
+        print(f"[{name}]")
+        for label, func in cases:
+            seconds = timed(func, repeats)
+            text = "RecursionError" if seconds is None else f"{seconds * 1000:9.2f} ms"
+            print(f"  {label:26} {text}")
+
+if __name__ == "__main__":
+    main()
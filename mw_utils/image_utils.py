@@ -0,0 +1,404 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# PIL comes from the plugin's "dependencies" folder, which the .pyp adds to sys.path before importing this module.
+try:
+    from PIL import Image, ImageChops, ImageMath, ImageStat
+except ImportError:
+    Image = None
+
+# PIL releases the GIL while decoding / resampling, so threads scale on multi-core machines.
+MAX_WORKERS = max(1, min(8, (os.cpu_count() or 2)))
+
+CHANNEL_TOLERANCE = 3 # max per-pixel difference (0-255) for channels to count as equal (JPEG chroma noise)
+
+def compact_channels(img, tolerance=CHANNEL_TOLERANCE):
+    """
+    Drops channels that carry no information: a fully opaque alpha, and identical R/G/B (-> L).
+    Uses band extrema (C-level) instead of per-pixel Python loops.
+    """
+    if img.mode not in ("RGBA", "RGB", "LA"):
+        return img
+
+    if img.mode in ("RGBA", "LA") and img.getchannel("A").getextrema()[0] >= 255 - tolerance:
+        img = img.convert("RGB" if img.mode == "RGBA" else "L")
+
+    if img.mode in ("RGB", "RGBA"):
+        r, g, b = img.getchannel("R"), img.getchannel("G"), img.getchannel("B")
+        if (ImageChops.difference(r, g).getextrema()[1] <= tolerance and
+                ImageChops.difference(g, b).getextrema()[1] <= tolerance):
+            img = img.convert("LA" if img.mode == "RGBA" else "L")
+    return img
+
+# --- Channel-aware Resampling ---
+
+RESIZE_MODE_DEFAULT = "default" # LANCZOS on the stored values
+RESIZE_MODE_NORMAL = "normal"   # filter decoded vectors, renormalize, re-encode
+RESIZE_MODE_HEIGHT = "height"   # float resample + mild unsharp, keeps 16-bit precision
+RESIZE_MODE_LINEAR = "linear"   # sRGB -> linear light, resample, back to sRGB
+
+HEIGHT_SHARPEN = 0.35 # unsharp amount for height / bump maps
+
+# Channels that hold sRGB encoded color (everything else is data and is resized as stored)
+COLOR_CHANNELS = ("base_color", "emission_color", "translucency")
+
+def resize_mode_for_channel(channel, linear_light=False, raw=False):
+    """
+    Resize mode for a PBR channel key from the file name (None if the name has no channel token).
+    linear_light enables gamma-correct resizing of color maps; raw (the sampler doesn't read the file as sRGB) disables it.
+    Without a name token only the sampler's colorspace decides: sRGB files are treated as color maps.
+    """
+    if channel == "normal":
+        return RESIZE_MODE_NORMAL
+    if channel in ("bump", "displacement"):
+        return RESIZE_MODE_HEIGHT
+    if linear_light and not raw and (channel is None or channel in COLOR_CHANNELS):
+        return RESIZE_MODE_LINEAR
+    return RESIZE_MODE_DEFAULT
+
+def resize_normal_map(img, size):
+    """
+    Downsamples a tangent space normal map: RGB is decoded to -1..1 vectors (float bands), filtered,
+    renormalized to unit length and re-encoded, so filtered normals don't get shorter (flatter shading).
+    """
+    alpha = img.getchannel("A").resize(size, Image.Resampling.LANCZOS) if img.mode in ("RGBA", "LA") else None
+
+    decode = [v / 127.5 - 1.0 for v in range(256)]
+    x, y, z = (band.point(decode, "F").resize(size, Image.Resampling.LANCZOS) for band in img.convert("RGB").split())
+
+    length = ImageMath.lambda_eval(
+        lambda a: a["max"]((a["x"] * a["x"] + a["y"] * a["y"] + a["z"] * a["z"]) ** 0.5, 1e-6), x=x, y=y, z=z)
+    # +128 instead of +127.5: F -> L truncates, this rounds
+    bands = [ImageMath.lambda_eval(lambda a: a["c"] / a["l"] * 127.5 + 128.0, c=c, l=length).convert("L") for c in (x, y, z)]
+
+    if alpha is not None:
+        bands.append(alpha)
+        return Image.merge("RGBA", bands)
+    return Image.merge("RGB", bands)
+
+def resize_height_map(img, size, sharpen=HEIGHT_SHARPEN):
+    """
+    Downsamples a height / bump map in float (no 8-bit rounding between steps) and restores
+    the fine detail lost by the filter with a mild unsharp mask. 16-bit input stays 16-bit.
+    """
+    is_16bit = img.mode.startswith("I")
+    height = img.convert("F") if is_16bit or img.mode == "F" else img.convert("L").convert("F")
+    height = height.resize(size, Image.Resampling.LANCZOS)
+
+    if sharpen and min(size) >= 4:
+        half = (max(1, size[0] // 2), max(1, size[1] // 2))
+        blurred = height.resize(half, Image.Resampling.BOX).resize(size, Image.Resampling.BILINEAR)
+        height = ImageMath.lambda_eval(lambda a: a["h"] + (a["h"] - a["b"]) * sharpen, h=height, b=blurred)
+
+    if is_16bit:
+        top = 65535.0 if img.mode != "I" else 2147483647.0
+        result = ImageMath.lambda_eval(lambda a: a["min"](a["max"](a["h"] + 0.5, 0.0), top), h=height).convert("I")
+        return result if img.mode == "I" else result.convert("I;16") # 16-bit PNG / TIFF
+    return ImageMath.lambda_eval(lambda a: a["h"] + 0.5, h=height).convert("L")
+
+# sRGB decode table (8-bit code -> linear 0-1 float), applied with Image.point in C
+SRGB_TO_LINEAR = [c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4 for c in (v / 255.0 for v in range(256))]
+SRGB_LINEAR_CUTOFF = 0.0031308
+
+def _linear_to_srgb8(a):
+    """
+    ImageMath expression: linear float band -> sRGB 0-255 (+0.5 for rounding).
+    The power curve above the cutoff plus the 12.92 linear toe below it, without a per-pixel branch.
+    """
+    t = SRGB_LINEAR_CUTOFF
+    x = a["x"]
+    encoded = 1.055 * a["max"](x, t) ** (1.0 / 2.4) - 0.055 + 12.92 * (a["min"](x, t) - t)
+    return a["min"](a["max"](encoded * 255.0 + 0.5, 0.0), 255.0)
+
+def resize_linear_light(img, size):
+    """
+    Downsamples an 8-bit sRGB color map in linear light: color bands are decoded with a lookup table,
+    filtered as float and re-encoded, so fine bright / dark detail keeps its average brightness.
+    Alpha is filtered as stored. Other modes fall back to a plain resize.
+    """
+    if img.mode not in ("L", "LA", "RGB", "RGBA"):
+        return img.resize(size, Image.Resampling.LANCZOS)
+
+    bands = list(img.split())
+    color_count = 1 if img.mode in ("L", "LA") else 3
+    for i in range(color_count):
+        linear = bands[i].point(SRGB_TO_LINEAR, "F").resize(size, Image.Resampling.LANCZOS)
+        bands[i] = ImageMath.lambda_eval(_linear_to_srgb8, x=linear).convert("L")
+    for i in range(color_count, len(bands)):
+        bands[i] = bands[i].resize(size, Image.Resampling.LANCZOS)
+    return Image.merge(img.mode, bands)
+
+def resize_and_strip_metadata(input_path, output_path, mode=RESIZE_MODE_DEFAULT):
+    """
+    Writes a half resolution copy without metadata, compacted to the channels actually used.
+    mode selects the filter (see resize_mode_for_channel). Returns (input mode, output mode, output size).
+    """
+    # EXR / HDR Check -> Unsupported
+    ext = os.path.splitext(input_path)[1].lower()
+    if ext in ['.exr', '.hdr']:
+        raise Exception(f"Unsupported format: {ext}")
+
+    if not Image:
+        raise ImportError("PIL not loaded")
+
+    with Image.open(input_path) as img:
+        input_mode = img.mode
+        new_size = (max(1, img.width // 2), max(1, img.height // 2))
+        if mode == RESIZE_MODE_NORMAL and img.mode in ("RGB", "RGBA"):
+            resized_img = resize_normal_map(img, new_size)
+        elif mode == RESIZE_MODE_HEIGHT:
+            resized_img = resize_height_map(img, new_size)
+        elif mode == RESIZE_MODE_LINEAR:
+            resized_img = resize_linear_light(img, new_size)
+        else:
+            resized_img = img.resize(new_size, Image.Resampling.LANCZOS)
+
+        # Strip metadata (EXIF / ICC / text chunks live in .info, the pixels are already a new image)
+        clean_img = compact_channels(resized_img)
+        clean_img.info = {}
+
+        ext = os.path.splitext(output_path)[1].lower()
+        if ext in ['.jpg', '.jpeg']:
+            clean_img.save(output_path, "JPEG", optimize=True, quality=85)
+        elif ext in ['.png']:
+             clean_img.save(output_path, "PNG", optimize=True)
+        elif ext in ['.tif', '.tiff']:
+             clean_img.save(output_path, "TIFF")
+        else:
+             clean_img.save(output_path)
+        return input_mode, clean_img.mode, clean_img.size
+
+def resize_files(jobs, progress=None, max_workers=MAX_WORKERS):
+    """
+    Runs resize_and_strip_metadata for every (input_path, output_path[, mode]) job on a thread pool.
+    progress(done, total) is called from the calling thread after each finished job.
+    Returns a list of (input_path, output_path, error, result) with error None on success
+    and result the (input mode, output mode, size) of resize_and_strip_metadata.
+    """
+    results = []
+    if not jobs:
+        return results
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(resize_and_strip_metadata, *job): job[:2] for job in jobs}
+        for future in as_completed(futures):
+            src, dst = futures[future]
+            error = future.exception()
+            results.append((src, dst, error, None if error else future.result()))
+            if progress:
+                progress(len(results), len(jobs))
+    return results
+
+def _mode_bands(mode):
+    return Image.getmodebands(mode) if Image else 0
+
+def summarize_resize_results(results):
+    """Short report of a resize_files run: files written, disk bytes saved, channels dropped."""
+    written = [r for r in results if r[2] is None]
+    if not written:
+        return ""
+
+    disk_before = disk_after = 0
+    compacted = 0
+    memory_saved = 0
+    for src, dst, error, (input_mode, output_mode, size) in written:
+        try:
+            disk_before += os.path.getsize(src)
+            disk_after += os.path.getsize(dst)
+        except OSError:
+            pass
+        dropped = _mode_bands(input_mode) - _mode_bands(output_mode)
+        if dropped > 0:
+            compacted += 1
+            memory_saved += size[0] * size[1] * dropped
+
+    mb = 1024.0 * 1024.0
+    msg = f"Resized {len(written)} files: {disk_before / mb:.2f} MB -> {disk_after / mb:.2f} MB on disk"
+    if compacted:
+        msg += f", {compacted} compacted to fewer channels (-{memory_saved / mb:.2f} MB texture memory)"
+    return msg
+
+# --- Content Classification ---
+
+THUMB_SIZE = 64
+MIN_CONFIDENCE = 0.5 # guesses below this are not used for connecting
+# Limits of the classifier: decode time follows the compressed size and the decoded pixel count
+# (after JPEG draft scaling). PNG / TIFF have no partial decode in PIL, so bigger files are left
+# unclassified instead of costing 100+ ms each (about 15 ms per MB).
+CLASSIFY_MAX_BYTES = 1024 * 1024
+CLASSIFY_MAX_PIXELS = 1024 * 1024
+
+def _load_thumbnail(path, size=THUMB_SIZE, mode="RGB", nearest=True, max_pixels=None):
+    """
+    Decodes a small thumbnail: JPEG via draft mode (DCT scaling), other formats by subsampling.
+    Nearest keeps the value distribution (masks stay binary, variance survives); the box filter
+    (nearest=False) keeps small features in the average, which is what constant probes need.
+    Returns None without decoding if the (drafted) image has more than max_pixels pixels.
+    """
+    with Image.open(path) as img:
+        img.draft(mode, (size, size))
+        if max_pixels and img.width * img.height > max_pixels:
+            return None
+        if img.mode == "P":
+            img = img.convert("RGBA")
+        elif img.mode.startswith("I"):
+            img = img.convert("I").point(lambda v: v * (1.0 / 256)).convert("L")
+        factor = max(1, min(img.width, img.height) // size)
+        if factor > 1:
+            if nearest:
+                img = img.resize((max(1, img.width // factor), max(1, img.height // factor)), Image.Resampling.NEAREST)
+            else:
+                img = img.reduce(factor)
+        return img.convert(mode)
+
+def ClassifyTextureContent(path, bits=8):
+    """
+    Guesses the PBR channel of a texture from a small thumbnail, for files without a channel token.
+    bits is the stored bit depth (16-bit grayscale is most likely height data).
+    Returns (channel, confidence 0..1), or (None, 0.0) if no guess can be made (also for files
+    above CLASSIFY_MAX_BYTES / CLASSIFY_MAX_PIXELS, which can't be decoded cheaply).
+    """
+    if not Image:
+        return None, 0.0
+    try:
+        if os.path.getsize(path) > CLASSIFY_MAX_BYTES:
+            return None, 0.0
+        thumb = _load_thumbnail(path, max_pixels=CLASSIFY_MAX_PIXELS)
+    except Exception:
+        return None, 0.0
+    if thumb is None:
+        return None, 0.0
+
+    stat = ImageStat.Stat(thumb)
+    mean_r, mean_g, mean_b = (m / 255.0 for m in stat.mean)
+    r, g, b = thumb.split()
+
+    # Normal map signature: flat normal is (0.5, 0.5, 1.0)
+    if abs(mean_r - 0.5) < 0.08 and abs(mean_g - 0.5) < 0.08 and mean_b > 0.7:
+        offset = max(abs(mean_r - 0.5), abs(mean_g - 0.5))
+        return "normal", 0.9 if offset < 0.04 else 0.7
+
+    # Grayscale-ness: mean absolute difference between bands
+    chroma = max(ImageStat.Stat(ImageChops.difference(r, g)).mean[0],
+                 ImageStat.Stat(ImageChops.difference(g, b)).mean[0]) / 255.0
+
+    lum = thumb.convert("L")
+    lum_stat = ImageStat.Stat(lum)
+    lum_mean = lum_stat.mean[0] / 255.0
+    lum_std = lum_stat.stddev[0] / 255.0
+    hist = lum.histogram()
+    total = float(sum(hist)) or 1.0
+    dark = sum(hist[:26]) / total
+    bright = sum(hist[230:]) / total
+
+    if chroma > 0.02:
+        # Mostly black with bright colored spots -> emission
+        if lum_mean < 0.1 and dark > 0.7:
+            return "emission_color", 0.5
+        return "base_color", 0.7 if chroma > 0.05 else 0.55
+
+    if lum_std < 0.01:
+        return None, 0.0 # constant: nothing to tell from the content
+
+    if dark + bright > 0.9 and dark > 0.05 and bright > 0.05:
+        return "metalness", 0.5 # binary mask
+    if bits >= 16:
+        return "displacement", 0.6
+    if lum_mean > 0.7 and bright > dark:
+        return "ao", 0.55 # mostly white with dark crevices
+    return "refl_roughness", 0.5
+
+def GuessMissingChannels(paths, taken=(), resolve=None, max_workers=MAX_WORKERS):
+    """
+    Content fallback for files whose names have no channel token.
+    Classifies paths in parallel and returns {channel: (path, confidence)} for confident guesses of
+    channels not in taken; the best guess wins per channel. resolve(path) maps tokenized paths to a real file.
+    """
+    if not paths:
+        return {}
+    samples = [resolve(p) if resolve else p for p in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        guesses = list(pool.map(ClassifyTextureContent, samples))
+
+    result = {}
+    for path, (channel, confidence) in zip(paths, guesses):
+        if not channel or channel in taken or confidence < MIN_CONFIDENCE:
+            continue
+        if channel not in result or confidence > result[channel][1]:
+            result[channel] = (path, confidence)
+    return result
+
+# --- Constant Textures ---
+
+CONSTANT_TOLERANCE = 2 # max spread (0-255) of the probe values
+
+def _is_constant_full(path, tolerance):
+    """Extrema of the full-resolution image: a single outlier pixel is averaged away in the thumbnail, not here."""
+    with Image.open(path) as img:
+        if img.mode.startswith("I"):
+            img = img.convert("I").point(lambda v: v * (1.0 / 256)).convert("L")
+        img = img.convert("RGBA")
+        return all(high - low <= tolerance for low, high in img.getextrema())
+
+def probe_constant_color(path, tolerance=CONSTANT_TOLERANCE):
+    """
+    Returns the (r, g, b, a) value (0-1, as stored in the file) of a texture whose pixels are constant
+    within tolerance, else None. A box-filtered thumbnail rejects most textures cheaply, but it averages
+    small features (a few pixels per block) away, so textures that pass it are confirmed on the
+    full-resolution extrema before they count as constant.
+    """
+    if not Image:
+        return None
+    try:
+        thumb = _load_thumbnail(path, mode="RGBA", nearest=False)
+        for low, high in thumb.getextrema():
+            if high - low > tolerance:
+                return None
+        if not _is_constant_full(path, tolerance):
+            return None
+    except Exception:
+        return None
+    return tuple(m / 255.0 for m in ImageStat.Stat(thumb).mean)
+
+def probe_constant_colors(paths, max_workers=MAX_WORKERS):
+    """probe_constant_color for many files on a thread pool; returns values in input order."""
+    if not paths:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(probe_constant_color, paths))
+
+# --- Channel Packing ---
+
+ORM_FILL = (255, 0, 0) # AO / roughness / metalness value for maps that are missing
+
+def _to_grayscale(img):
+    if img.mode.startswith("I"):
+        return img.convert("I").point(lambda v: v * (1.0 / 256)).convert("L")
+    return img.convert("L")
+
+def pack_orm(ao_path, rough_path, metal_path, output_path):
+    """
+    Packs AO / roughness / metalness maps into the R / G / B channels of one image (Image.merge, single pass).
+    Missing maps (None) are filled with ORM_FILL; all maps are resampled to the largest input resolution.
+    Returns the output size.
+    """
+    if not Image:
+        raise ImportError("PIL not loaded")
+
+    bands = []
+    for path in (ao_path, rough_path, metal_path):
+        if path:
+            with Image.open(path) as img:
+                bands.append(_to_grayscale(img))
+        else:
+            bands.append(None)
+
+    size = max((b.size for b in bands if b is not None), key=lambda s: s[0] * s[1])
+    for index, band in enumerate(bands):
+        if band is None:
+            bands[index] = Image.new("L", size, ORM_FILL[index])
+        elif band.size != size:
+            bands[index] = band.resize(size, Image.Resampling.BICUBIC)
+
+    Image.merge("RGB", bands).save(output_path, optimize=True)
+    return size
@@ -0,0 +1,333 @@
+import c4d # 모듈이여도 c4d는 항상 필요
+import math
+
+try:
+    from . import mw_utils
+except ImportError:
+    import mw_utils
+    if not hasattr(mw_utils, "GetFullCache"): # the mw_utils package was imported first (Octane plugins)
+        from mw_utils import mw_utils
+
+# numpy is optional (not bundled): used when the host Python has it, otherwise the same math runs over
+# flat float buffers in Python.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# --- Texel Density ---
+# Surface statistics are read from the raw point / polygon / UVW tag buffers (GetLowlevelDataAddressR),
+# never through per-polygon Python objects (GetAllPolygons / GetAllPoints / GetSlow).
+
+CM_PER_METER = 100.0 # Cinema 4D stores lengths in cm, whatever the display unit
+
+def _buffer_format(buf, count, components):
+    """'d' or 'f' depending on how many bytes the tag stores per component (Vector vs Vector32)."""
+    nbytes = memoryview(buf).nbytes
+    if count == 0:
+        return None
+    size = nbytes // (count * components)
+    return {8: "d", 4: "f"}.get(size)
+
+def _read_mesh_buffers(mesh):
+    """(points, polygons, uvs, formats) raw buffers of a polygon object, or None if it has no UVW tag."""
+    point_count = mesh.GetPointCount()
+    poly_count = mesh.GetPolygonCount()
+    point_tag = mesh.GetTag(c4d.Tpoint)
+    poly_tag = mesh.GetTag(c4d.Tpolygon)
+    uvw_tag = mesh.GetTag(c4d.Tuvw)
+    if not point_count or not poly_count or not point_tag or not poly_tag or not uvw_tag:
+        return None
+
+    points = point_tag.GetLowlevelDataAddressR()
+    polys = poly_tag.GetLowlevelDataAddressR()
+    uvs = uvw_tag.GetLowlevelDataAddressR()
+    formats = (_buffer_format(points, point_count, 3), _buffer_format(uvs, poly_count, 12))
+    if None in formats or memoryview(polys).nbytes != poly_count * 16:
+        return None
+    return points, polys, uvs, formats
+
+def _matrix_rows(mg):
+    """c4d.Matrix -> (off, v1, v2, v3) as plain float tuples."""
+    return tuple((v.x, v.y, v.z) for v in (mg.off, mg.v1, mg.v2, mg.v3))
+
+def _areas_numpy(points, polys, uvs, formats, matrix):
+    """World space surface area and UV area of one mesh, vectorized."""
+    off, v1, v2, v3 = (np.array(v, dtype=np.float64) for v in matrix)
+    pts = np.frombuffer(points, dtype=np.float64 if formats[0] == "d" else np.float32).reshape(-1, 3).astype(np.float64)
+    pts = off + pts[:, 0:1] * v1 + pts[:, 1:2] * v2 + pts[:, 2:3] * v3
+    idx = np.frombuffer(polys, dtype=np.int32).reshape(-1, 4)
+    is_quad = idx[:, 2] != idx[:, 3]
+
+    a, b, c, d = (pts[idx[:, i]] for i in range(4))
+    world = 0.5 * (np.linalg.norm(np.cross(b - a, c - a), axis=1) +
+                   np.linalg.norm(np.cross(c - a, d - a), axis=1) * is_quad)
+
+    uv = np.frombuffer(uvs, dtype=np.float64 if formats[1] == "d" else np.float32).reshape(-1, 4, 3).astype(np.float64)
+    ua, ub, uc, ud = (uv[:, i, :2] for i in range(4))
+
+    def cross2(p, q):
+        return p[:, 0] * q[:, 1] - p[:, 1] * q[:, 0]
+
+    uv_area = 0.5 * (np.abs(cross2(ub - ua, uc - ua)) + np.abs(cross2(uc - ua, ud - ua)) * is_quad)
+    return float(world.sum()), float(uv_area.sum())
+
+AREA_CHUNK = 262144 # polygons per pass of _areas_python (bounds the temporary index / UV lists)
+
+def _areas_python(points, polys, uvs, formats, matrix):
+    """
+    Same as _areas_numpy over flat typed buffers, for hosts without numpy.
+    Polygon indices and UVs are unpacked chunk-wise from strided memoryview slices, so the loop body only
+    does float math; the matrix offset is skipped (areas do not depend on translation).
+    """
+    _, v1, v2, v3 = matrix
+    raw = memoryview(points).cast("B").cast(formats[0])
+    xs, ys, zs = raw[0::3].tolist(), raw[1::3].tolist(), raw[2::3].tolist()
+    wx = [x * v1[0] + y * v2[0] + z * v3[0] for x, y, z in zip(xs, ys, zs)]
+    wy = [x * v1[1] + y * v2[1] + z * v3[1] for x, y, z in zip(xs, ys, zs)]
+    wz = [x * v1[2] + y * v2[2] + z * v3[2] for x, y, z in zip(xs, ys, zs)]
+    del xs, ys, zs
+    all_idx = memoryview(polys).cast("B").cast("i")
+    all_uv = memoryview(uvs).cast("B").cast(formats[1])
+    sqrt = math.sqrt
+
+    world = 0.0
+    uv_area = 0.0
+    for first in range(0, len(all_idx) // 4, AREA_CHUNK):
+        idx = all_idx[first * 4:(first + AREA_CHUNK) * 4]
+        uv = all_uv[first * 12:(first + AREA_CHUNK) * 12]
+        columns = [idx[i::4].tolist() for i in range(4)] + [uv[i::12].tolist() for i in (0, 1, 3, 4, 6, 7, 9, 10)]
+        for ia, ib, ic, id_, ua, va, ub, vb, uc, vc, ud, vd in zip(*columns):
+            ax, ay, az = wx[ia], wy[ia], wz[ia]
+            bx, by, bz = wx[ib] - ax, wy[ib] - ay, wz[ib] - az
+            cx, cy, cz = wx[ic] - ax, wy[ic] - ay, wz[ic] - az
+            nx, ny, nz = by * cz - bz * cy, bz * cx - bx * cz, bx * cy - by * cx
+            world += sqrt(nx * nx + ny * ny + nz * nz)
+
+            uc -= ua
+            vc -= va
+            uv_area += abs((ub - ua) * vc - (vb - va) * uc)
+
+            if ic != id_:
+                dx, dy, dz = wx[id_] - ax, wy[id_] - ay, wz[id_] - az
+                nx, ny, nz = cy * dz - cz * dy, cz * dx - cx * dz, cx * dy - cy * dx
+                world += sqrt(nx * nx + ny * ny + nz * nz)
+                uv_area += abs(uc * (vd - va) - vc * (ud - ua))
+    return 0.5 * world, 0.5 * uv_area
+
+def GetMeshAreas(mesh):
+    """
+    (world space area in cm², UV area in 0-1 tile units) of a polygon object, using its global matrix.
+    Returns None if the mesh has no UVW tag or unexpected buffer layouts.
+    """
+    buffers = _read_mesh_buffers(mesh)
+    if buffers is None:
+        return None
+    points, polys, uvs, formats = buffers
+    if np is not None:
+        return _areas_numpy(points, polys, uvs, formats, _matrix_rows(mesh.GetMg()))
+    return _areas_python(points, polys, uvs, formats, _matrix_rows(mesh.GetMg()))
+
+def GetMaterialSurfaces(doc):
+    """
+    World / UV area of the final cache meshes of every textured object: {material: [(object, world cm², uv area)]}.
+    Only UVW-projected texture tags count (their tiling scales the UV area); selection restrictions are ignored,
+    so a tag is measured over its whole object.
+    """
+    surfaces = {}
+    for obj in mw_utils.GetAllObjects(doc):
+        tags = [tag for tag in obj.GetTags() if tag.CheckType(c4d.Ttexture) and tag.GetMaterial() is not None
+                and tag[c4d.TEXTURETAG_PROJECTION] == c4d.TEXTURETAG_PROJECTION_UVW]
+        if not tags:
+            continue
+
+        mesh_areas = [areas for areas in (GetMeshAreas(mesh) for mesh in mw_utils.GetFullCache(obj)) if areas and areas[1] > 0]
+        world = sum(areas[0] for areas in mesh_areas)
+        uv_area = sum(areas[1] for areas in mesh_areas)
+        if not world:
+            continue
+
+        for tag in tags:
+            tiles = max(1e-6, abs(tag[c4d.TEXTURETAG_TILESX] or 1.0) * abs(tag[c4d.TEXTURETAG_TILESY] or 1.0))
+            surfaces.setdefault(tag.GetMaterial(), []).append((obj, world, uv_area * tiles))
+    return surfaces
+
+def GetRequiredResolution(world_area_cm2, uv_area, pixels_per_meter):
+    """
+    Texture edge length (px) that gives pixels_per_meter on a surface: pixels on the surface are
+    uv_area x N², so N = density x sqrt(world area / uv area).
+    """
+    if world_area_cm2 <= 0 or uv_area <= 0:
+        return 0
+    return pixels_per_meter * math.sqrt((world_area_cm2 / (CM_PER_METER * CM_PER_METER)) / uv_area)
+
+def GetSuggestedLevel(resolution, required, min_size=256):
+    """Halvings of a texture (longest side = resolution) that still cover the required edge length."""
+    levels = 0
+    while resolution >> (levels + 1) >= max(required, min_size):
+        levels += 1
+    return levels
+
+def GetRequiredResolutions(doc, pixels_per_meter):
+    """{material: texture edge length (px)} for the object that needs the most texels per UV area."""
+    return {mat: max(GetRequiredResolution(world, uv_area, pixels_per_meter) for _, world, uv_area in objects)
+            for mat, objects in GetMaterialSurfaces(doc).items()}
+
+# --- Camera Distance LOD ---
+# Screen size of an object = projected extent (px) of its cache meshes' world bounding box through the render camera.
+
+NEAR_CLIP = 1.0 # cm; boxes reaching behind this plane surround the camera and count as full frame
+
+def GetMaterialObjects(doc):
+    """{material: [objects with a texture tag of that material]}."""
+    result = {}
+    for obj in mw_utils.GetAllObjects(doc):
+        for tag in obj.GetTags():
+            if tag.CheckType(c4d.Ttexture) and tag.GetMaterial() is not None:
+                objects = result.setdefault(tag.GetMaterial(), [])
+                if obj not in objects:
+                    objects.append(obj)
+    return result
+
+def _world_box(obj):
+    """8 corners of the world space bounding box around all cache meshes of obj, or None."""
+    low = [float("inf")] * 3
+    high = [float("-inf")] * 3
+    for mesh in mw_utils.GetFullCache(obj):
+        mp, rad, mg = mesh.GetMp(), mesh.GetRad(), mesh.GetMg()
+        for sx in (-1, 1):
+            for sy in (-1, 1):
+                for sz in (-1, 1):
+                    p = mg * c4d.Vector(mp.x + sx * rad.x, mp.y + sy * rad.y, mp.z + sz * rad.z)
+                    for i, v in enumerate((p.x, p.y, p.z)):
+                        low[i] = min(low[i], v)
+                        high[i] = max(high[i], v)
+    if low[0] == float("inf"):
+        return None
+    return [(x, y, z) for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])]
+
+def _camera_state(cam, rd):
+    """Everything the projection needs at one frame: (inverse camera matrix rows, focal length in px, xres, yres)."""
+    xres, yres = rd[c4d.RDATA_XRES], rd[c4d.RDATA_YRES]
+    aperture = cam[c4d.CAMERAOBJECT_APERTURE] or 36.0
+    focal_px = xres * (cam[c4d.CAMERA_FOCUS] or 36.0) / aperture
+    return _matrix_rows(~cam.GetMg()), focal_px, xres, yres
+
+def _screen_size(corners, camera):
+    """Longest projected side (px, clipped to the frame) of a world box seen through a camera state."""
+    (off, v1, v2, v3), focal_px, xres, yres = camera
+    depths = [off[2] + x * v1[2] + y * v2[2] + z * v3[2] for x, y, z in corners]
+    if max(depths) <= NEAR_CLIP:
+        return 0.0 # behind the camera
+    if min(depths) <= NEAR_CLIP:
+        return float(max(xres, yres)) # the box surrounds the camera plane
+
+    xs = [(off[0] + x * v1[0] + y * v2[0] + z * v3[0]) * focal_px / cz for (x, y, z), cz in zip(corners, depths)]
+    ys = [(off[1] + x * v1[1] + y * v2[1] + z * v3[1]) * focal_px / cz for (x, y, z), cz in zip(corners, depths)]
+
+    def extent(values, size):
+        half = size * 0.5
+        return max(0.0, min(max(values), half) - max(min(values), -half))
+
+    width, height = extent(xs, xres), extent(ys, yres)
+    return max(width, height) if width > 0 and height > 0 else 0.0
+
+def _is_animated(obj):
+    """True if obj, an ancestor or a child has animation tracks (its box may change over time)."""
+    node = obj
+    while node:
+        if node.GetCTracks():
+            return True
+        node = node.GetUp()
+    return any(child.GetCTracks() for child in mw_utils.GetAllChildren(obj, parent=False))
+
+def _dirty_signature(obj):
+    """Dirty counters that change when obj's box can change: its data / cache / matrix and its ancestors' matrices."""
+    signature = [obj.GetDirty(c4d.DIRTYFLAGS_DATA | c4d.DIRTYFLAGS_MATRIX | c4d.DIRTYFLAGS_CACHE | c4d.DIRTYFLAGS_CHILDREN)]
+    node = obj.GetUp()
+    while node:
+        signature.append(node.GetDirty(c4d.DIRTYFLAGS_MATRIX | c4d.DIRTYFLAGS_DATA))
+        node = node.GetUp()
+    return tuple(signature)
+
+class ScreenSizeCache(object):
+    """
+    Results of the last camera analysis of one document, keyed by dirty counters.
+    Camera states are kept per frame; static objects keep one box, animated objects one box per frame.
+    Counters are recorded after the document is back at its own time, so an unchanged scene reruns without
+    evaluating a single frame, and an edit to a static prop only re-reads that prop's box.
+    """
+    def __init__(self):
+        self.camera_key = None
+        self.cameras = {}  # frame -> camera state
+        self.objects = {}  # guid -> [signature, animated, box or {frame: box}]
+
+_SCREEN_CACHES = mw_utils.DocumentCache(ScreenSizeCache) # dropped with their document
+
+def GetScreenSizeCache(doc):
+    return _SCREEN_CACHES.Get(doc)
+
+def _camera_key(doc, cam, rd, frames):
+    return (cam.GetGUID(), _dirty_signature(cam), rd.GetDirty(c4d.DIRTYFLAGS_DATA), frames,
+            doc.GetRenderBaseDraw().GetSceneCamera(doc) is None)
+
+def GetMaxScreenSizes(doc, objects, progress=None):
+    """
+    Largest on-screen size (px) of each object over the render frame range, through the render camera.
+    Only frames missing from the document's ScreenSizeCache are evaluated (doc.ExecutePasses).
+    progress(done, total) is called per evaluated frame. Returns {object: px}.
+    """
+    cache = GetScreenSizeCache(doc)
+    rd = doc.GetActiveRenderData()
+    bd = doc.GetRenderBaseDraw()
+    fps = doc.GetFps()
+    start = rd[c4d.RDATA_FRAMEFROM].GetFrame(fps)
+    end = rd[c4d.RDATA_FRAMETO].GetFrame(fps)
+    frames = tuple(range(start, end + 1, max(1, rd[c4d.RDATA_FRAMESTEP] or 1)))
+
+    def camera():
+        return bd.GetSceneCamera(doc) or bd.GetEditorCamera()
+
+    if cache.camera_key != _camera_key(doc, camera(), rd, frames):
+        cache.cameras = {}
+
+    entries = {}
+    for obj in objects:
+        guid = obj.GetGUID()
+        entry = cache.objects.get(guid)
+        if entry is None or entry[0] != _dirty_signature(obj):
+            animated = _is_animated(obj)
+            entry = [None, animated, {} if animated else _world_box(obj)]
+            cache.objects[guid] = entry
+        entries[obj] = entry
+
+    needed = [f for f in frames if f not in cache.cameras or
+              any(entry[1] and f not in entry[2] for entry in entries.values())]
+    if needed:
+        original_time = doc.GetTime()
+        for index, frame in enumerate(needed):
+            doc.SetTime(c4d.BaseTime(frame, fps))
+            doc.ExecutePasses(None, True, True, True, c4d.BUILDFLAGS_NONE)
+            cache.cameras[frame] = _camera_state(camera(), rd)
+            for obj, entry in entries.items():
+                if entry[1] and frame not in entry[2]:
+                    entry[2][frame] = _world_box(obj)
+            if progress:
+                progress(index + 1, len(needed))
+        doc.SetTime(original_time)
+        doc.ExecutePasses(None, True, True, True, c4d.BUILDFLAGS_NONE)
+
+    # Counters as of the document's own time (evaluating other frames bumps them)
+    cache.camera_key = _camera_key(doc, camera(), rd, frames)
+    for obj, entry in entries.items():
+        entry[0] = _dirty_signature(obj)
+
+    sizes = {}
+    for obj, entry in entries.items():
+        size = 0.0
+        for frame in frames:
+            box = entry[2].get(frame) if entry[1] else entry[2]
+            if box:
+                size = max(size, _screen_size(box, cache.cameras[frame]))
+        sizes[obj] = size
+    return sizes
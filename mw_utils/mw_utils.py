@@ -2,27 +2,195 @@ import c4d # 모듈이여도 c4d는 항상 필요
 import maxon
 import os
 import re
+import array
+
+# numpy 는 선택 사항 (번들하지 않음). 없으면 같은 계산을 Python 으로 수행
+# (numpy is optional and not bundled; without it the same work runs in plain Python)
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def _compile_filter(doc=None, types=None, layer=None, bits=None, predicate=None):
+    """
+    순회 필터를 하나의 callable 로 만듭니다. 필터가 없으면 None. (Builds one test from the optional filters, AND-combined; None if unfiltered)
+    types: 타입 ID 또는 튜플 (IsInstanceOf), layer: LayerObject, bits: BIT_ 플래그 또는 튜플 (모두 설정), predicate: callable(obj) -> bool
+    """
+    if types is not None:
+        types = tuple(types) if isinstance(types, (tuple, list, set)) else (types,)
+    if bits is not None:
+        bits = tuple(bits) if isinstance(bits, (tuple, list, set)) else (bits,)
+    if types is None and layer is None and not bits and predicate is None:
+        return None
+
+    def test(obj):
+        if types is not None:
+            for type_id in types:
+                if obj.IsInstanceOf(type_id):
+                    break
+            else:
+                return False
+        if layer is not None and obj.GetLayerObject(doc) != layer:
+            return False
+        if bits:
+            for bit in bits:
+                if not obj.GetBit(bit):
+                    return False
+        return predicate is None or bool(predicate(obj))
+    return test
+
+def IterHierarchy(first, doc=None, types=None, layer=None, bits=None, predicate=None):
+    """
+    first 와 그 형제들, 모든 하위 오브젝트를 전위 순회(pre-order)하는 제너레이터입니다.
+    재귀 대신 명시적 스택을 사용하므로 깊은 계층(CAD 임포트)에서도 재귀 한도에 걸리지 않습니다.
+    (Pre-order generator over first, its siblings and all descendants. Explicit stack instead of recursion:
+    no recursion limit, no intermediate lists, and the caller can stop early by breaking out of the loop.)
+
+    :param first: 시작 오브젝트 :type first: c4d.BaseObject
+    :param doc: layer 필터에 필요 :type doc: c4d.documents.BaseDocument
+    :param types: 타입 ID 또는 튜플 :param layer: 레이어 :param bits: BIT_ 플래그 또는 튜플 :param predicate: callable(obj) -> bool
+    """
+    test = _compile_filter(doc, types, layer, bits, predicate)
+    stack = [] # 자식으로 내려갈 때 남겨둔 형제들 (siblings left behind when descending)
+    obj = first
+    while obj:
+        if test is None or test(obj):
+            yield obj
+        down = obj.GetDown()
+        nxt = obj.GetNext()
+        if down:
+            if nxt:
+                stack.append(nxt)
+            obj = down
+        elif nxt:
+            obj = nxt
+        else:
+            obj = stack.pop() if stack else None
+
+def IterAllObjects(doc, types=None, layer=None, bits=None, predicate=None):
+    """
+    씬 내의 모든 오브젝트를 순회하는 제너레이터입니다. (Generator over every object of the scene, pre-order)
+    """
+    return IterHierarchy(doc.GetFirstObject(), doc, types, layer, bits, predicate)
+
+def IterAllChildren(objects, parent=True, doc=None, types=None, layer=None, bits=None, predicate=None):
+    """
+    입력 오브젝트(들)의 모든 하위 오브젝트를 순회하는 제너레이터입니다. parent=True 면 입력 오브젝트도 포함합니다.
+    (Generator over all descendants of an object or list of objects, optionally including the inputs themselves)
+    """
+    if objects is None:
+        return
+    test = _compile_filter(doc, types, layer, bits, predicate)
+    for o in (objects if isinstance(objects, list) else [objects]):
+        if o is None:
+            continue
+        if parent and (test is None or test(o)):
+            yield o
+        down = o.GetDown()
+        if down:
+            yield from IterHierarchy(down, doc, types, layer, bits, predicate)
 
 def GetAllObjects(doc):
     """
     씬 내의 모든 오브젝트를 리스트로 반환합니다.
     """
-    result = []
-    def _collect(obj):
-        while obj:
-            result.append(obj)
-            _collect(obj.GetDown())
-            obj = obj.GetNext()
-            
-    _collect(doc.GetFirstObject())
-    return result
+    return list(IterAllObjects(doc))
+
+def GetOpenDocuments():
+    """
+    열려 있는 모든 문서를 리스트로 반환합니다. (Every document open in the editor, in document list order)
+    """
+    docs = []
+    doc = c4d.documents.GetFirstDocument()
+    while doc:
+        docs.append(doc)
+        doc = doc.GetNext()
+    return docs
+
+def _is_open(doc, open_docs):
+    try:
+        return any(doc == other for other in open_docs)
+    except ReferenceError: # 이미 해제된 문서 (the document was freed)
+        return False
+
+class DocumentCache(object):
+    """
+    문서별 값 저장소. 접근할 때마다 더 이상 열려 있지 않은 문서의 값을 버립니다.
+    (Per-document values that do not outlive their document: on every access, entries of documents that are no longer
+    open are dropped, releasing the objects, graphs and nodes they reference. Documents that are not open, e.g.
+    render clones or temporary documents, get a fresh value that is not kept.)
+
+    :param factory: 새 값을 만드는 callable :type factory: callable
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self.entries = {}  # document -> value
+
+    def Get(self, doc):
+        open_docs = GetOpenDocuments()
+        for key in [key for key in self.entries if not _is_open(key, open_docs)]:
+            del self.entries[key]
+        if not _is_open(doc, open_docs):
+            return self.factory()
+        value = self.entries.get(doc)
+        if value is None:
+            value = self.entries[doc] = self.factory()
+        return value
+
+    def Clear(self, doc=None):
+        """doc 의 값, 또는 None 이면 모든 값을 버립니다. (Drops doc's value, or every value if doc is None)"""
+        if doc is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(doc, None)
+
+class LayerIndex(object):
+    """
+    레이어 -> 오브젝트 인덱스. 씬을 한 번만 순회해서 만들고, 오브젝트/계층 dirty 가 바뀌면 다시 만듭니다.
+    (Layer -> objects index of one document, built in a single traversal and rebuilt when the document's
+    object or hierarchy dirty counter changes, e.g. an object is added, moved or assigned to another layer.)
+    """
+    def __init__(self):
+        self.dirty = None
+        self.layers = {}  # layer GUID (None = 레이어 없음) -> (layer, [objects])
+
+_LAYER_INDEXES = DocumentCache(LayerIndex)
+
+def GetLayerIndex(doc):
+    """
+    문서의 LayerIndex 를 반환합니다. 변경이 없으면 다시 순회하지 않습니다. 닫힌 문서의 인덱스는 버려집니다.
+    (Returns the document's LayerIndex, re-walking the scene only when it changed; indexes of closed documents are dropped)
+    """
+    index = _LAYER_INDEXES.Get(doc)
+    dirty = doc.GetHDirty(c4d.HDIRTYFLAGS_OBJECT | c4d.HDIRTYFLAGS_OBJECT_HIERARCHY)
+    if index.dirty != dirty:
+        layers = {}
+        for obj in IterAllObjects(doc):
+            layer = obj.GetLayerObject(doc)
+            key = layer.GetGUID() if layer else None
+            entry = layers.get(key)
+            if entry is None:
+                entry = layers[key] = (layer, [])
+            entry[1].append(obj)
+        index.layers = layers
+        index.dirty = dirty
+    return index
 
 def GetObjectsInLayer(doc, layer_obj):
     """
-    주어진 레이어(layer_obj)에 할당된 모든 오브젝트를 리스트로 반환합니다.
+    주어진 레이어(layer_obj)에 할당된 모든 오브젝트를 리스트로 반환합니다. layer_obj 가 None 이면 레이어가 없는 오브젝트들.
+    (Objects assigned to layer_obj, or to no layer if None. Served from the LayerIndex)
+    """
+    entry = GetLayerIndex(doc).layers.get(layer_obj.GetGUID() if layer_obj else None)
+    return list(entry[1]) if entry else []
+
+def GetObjectsByLayer(doc):
+    """
+    모든 레이어와 그 오브젝트들을 한 번의 순회로 반환합니다. (Every layer with its objects, one traversal for all layers)
+
+    :return: [(layer 또는 None, [objects])] :rtype: list[tuple[c4d.documents.LayerObject | None, list[c4d.BaseObject]]]
     """
-    all_objs = GetAllObjects(doc)
-    return [obj for obj in all_objs if obj.GetLayerObject(doc) == layer_obj]
+    return [(layer, list(objects)) for layer, objects in GetLayerIndex(doc).layers.values()]
 
 def GetAllChildren(objects, parent=True) -> list:
     """
@@ -33,25 +201,144 @@ def GetAllChildren(objects, parent=True) -> list:
     :param objects: 부모 오브젝트 또는 오브젝트 리스트 :type objects: c4d.BaseObject | list[c4d.BaseObject]
     :return: 자식 오브젝트들을 포함한 리스트 :rtype: list[c4d.BaseObject]
     """
+    return list(IterAllChildren(objects, parent))
+
+def _walk_cache(root, deform, children):
+    """
+    캐시 계층 하나를 명시적 스택으로 탐색하여 메쉬 리스트를 반환합니다. (Meshes of one cache hierarchy, explicit stack)
+    순서는 기존 재귀와 같습니다: DeformCache 우선, Cache, 자기 자신, 자식 순서. (Same order as the former recursion)
+    """
+    result = []
+    stack = [root]
+    while stack:
+        current_obj = stack.pop()
+        # DeformCache 우선 (옵션), 하위 오브젝트는 DeformCache 내부에서만 탐색
+        if deform:
+            deform_cache = current_obj.GetDeformCache()
+            if deform_cache is not None:
+                stack.append(deform_cache)
+                continue
+        # 자식은 역순으로 먼저 넣고, 캐시를 마지막에 넣어 캐시가 먼저 나오도록 (cache first, then children in order)
+        if children:
+            kids = []
+            child_obj = current_obj.GetDown()
+            while child_obj is not None:
+                kids.append(child_obj)
+                child_obj = child_obj.GetNext()
+            stack.extend(reversed(kids))
+        cache_obj = current_obj.GetCache()
+        if cache_obj is not None:
+            stack.append(cache_obj)
+        elif not current_obj.GetBit(c4d.BIT_CONTROLOBJECT): # 제너레이터로 생성된 오브젝트는 무시
+            if current_obj.IsInstanceOf(c4d.Opolygon):
+                result.append(current_obj)
+    return result
+
+def _build_own_cache(obj, deform, children):
+    """
+    씬 오브젝트 하나의 캐시 메쉬 (자식 씬 오브젝트 제외)와, 자식 탐색을 멈출지 여부. (Own meshes of one scene object, stop flag)
+    """
+    if deform:
+        deform_cache = obj.GetDeformCache()
+        if deform_cache is not None:
+            return _walk_cache(deform_cache, deform, children), True
+    cache_obj = obj.GetCache()
+    if cache_obj is not None:
+        return _walk_cache(cache_obj, deform, children), False
+    if not obj.GetBit(c4d.BIT_CONTROLOBJECT) and obj.IsInstanceOf(c4d.Opolygon):
+        return [obj], False
+    return [], False
+
+FULL_CACHE_LIMIT = 65536 # 문서당 저장하는 씬 오브젝트 수, 넘으면 가장 오래된 것부터 버림 (memoized objects per document)
+_FULL_CACHES = DocumentCache(dict) # document -> {(GUID, deform, children): (signature, meshes, stop)}
+
+def _cache_signature(obj, deform):
+    # dirty 카운터 + 캐시 루트 자체: 제너레이터가 캐시를 다시 만들면 루트 오브젝트가 바뀝니다 (a rebuilt cache is a new root object)
+    return (obj.GetDirty(c4d.DIRTYFLAGS_CACHE | c4d.DIRTYFLAGS_DATA | c4d.DIRTYFLAGS_MATRIX),
+            obj.GetBit(c4d.BIT_CONTROLOBJECT),
+            obj.GetDeformCache() if deform else None,
+            obj.GetCache())
+
+def _own_cache(obj, deform, children, memo):
+    # 문서 밖의 오브젝트, 캐시 내부 오브젝트(GUID 가 고유하지 않음)는 저장하지 않음 (no memo outside documents / inside caches)
+    if memo is None or obj.GetCacheParent() is not None:
+        return _build_own_cache(obj, deform, children)
+    key = (obj.GetGUID(), deform, children)
+    signature = _cache_signature(obj, deform)
+    entry = memo.get(key)
+    if entry is not None:
+        try:
+            if entry[0] == signature:
+                return entry[1], entry[2]
+        except ReferenceError: # 이전 캐시가 이미 해제됨 (the previous cache was freed)
+            pass
+    elif len(memo) >= FULL_CACHE_LIMIT:
+        del memo[next(iter(memo))]
+    meshes, stop = _build_own_cache(obj, deform, children)
+    memo[key] = (signature, meshes, stop)
+    return meshes, stop
+
+def ClearFullCache(doc=None):
+    """
+    IterFullCache / GetFullCache 의 저장된 결과를 비웁니다. 닫힌 문서의 결과는 자동으로 버려집니다.
+    (Drops the memoized cache results of doc, or of every document if None. Results of closed documents are
+    dropped automatically on the next query.)
+    """
+    _FULL_CACHES.Clear(doc)
+
+def IterFullCache(objects, parent=True, deform=True, children=True):
+    """
+    GetFullCache 의 제너레이터 버전입니다. 씬 오브젝트마다 결과를 저장해 두고, dirty 카운터(CACHE, DATA, MATRIX)나
+    캐시 루트가 바뀐 오브젝트만 다시 탐색합니다. 씬 계층은 명시적 스택으로 순회합니다.
+    (Generator version of GetFullCache. Each scene object's own cache meshes are memoized and re-walked only when its
+    dirty counters or cache root changed, so repeated queries on cloner-heavy scenes only pay for what changed.
+    The memo is kept per document (at most FULL_CACHE_LIMIT objects, dropped with the document); objects that are
+    not in a document are not memoized.)
+
+    :param objects: 오브젝트 또는 오브젝트 리스트 :type objects: c4d.BaseObject | list[c4d.BaseObject]
+    :param parent: 입력 오브젝트도 결과에 포함할지 여부 :type parent: bool
+    :param deform: DeformCache도 탐색할지 여부 :type deform: bool
+    :param children: 자식 오브젝트도 탐색할지 여부 :type children: bool
+    """
     if objects is None:
-        return []
-    objs = objects if isinstance(objects, list) else [objects]
-    
-    children = []
-    for o in objs:
-        if o is None:
+        return
+    memo_doc = memo = None
+    for root_obj in (objects if isinstance(objects, list) else [objects]):
+        if root_obj is None:
+            continue
+        doc = root_obj.GetDocument()
+        if doc is None:
+            memo = None
+        elif memo is None or doc != memo_doc:
+            memo_doc, memo = doc, _FULL_CACHES.Get(doc)
+        if parent:
+            meshes, stop = _own_cache(root_obj, deform, children, memo)
+            yield from meshes
+            if stop:
+                continue
+        if not children:
             continue
-        if parent: children.append(o)
-        child = o.GetDown()
-        while child:
-            children.extend(GetAllChildren(child))
-            child = child.GetNext()
-    return children
+        # 하위 씬 오브젝트 순회 (IterHierarchy 와 같은 방식, DeformCache 가 있는 오브젝트의 자식은 건너뜀)
+        stack = []
+        obj = root_obj.GetDown()
+        while obj:
+            meshes, stop = _own_cache(obj, deform, children, memo)
+            yield from meshes
+            down = None if stop else obj.GetDown()
+            nxt = obj.GetNext()
+            if down:
+                if nxt:
+                    stack.append(nxt)
+                obj = down
+            elif nxt:
+                obj = nxt
+            else:
+                obj = stack.pop() if stack else None
 
 def GetFullCache(objects, parent=True, deform=True, children=True) -> list:
     """
     입력값은 단일 오브젝트 또는 오브젝트 리스트 모두 허용합니다.
-    DeformCache, Cache, 하위 오브젝트까지 재귀적으로 탐색하여 모든 메쉬를 리스트로 반환합니다.
+    DeformCache, Cache, 하위 오브젝트까지 탐색하여 모든 메쉬를 리스트로 반환합니다. (IterFullCache 의 리스트 버전)
     deform=False로 지정하면 DeformCache는 무시하고 Cache만 탐색합니다. (최적화용)
     (Accepts single object or list of objects, always returns a list of meshes including Cache and children. If deform=False, ignores DeformCache.)
 
@@ -61,51 +348,146 @@ def GetFullCache(objects, parent=True, deform=True, children=True) -> list:
     :param children: 자식 오브젝트도 탐색할지 여부 :type children: bool
     :return: 최종 캐시 메쉬 오브젝트 리스트 :rtype: list[c4d.PointObject]
     """
-    # print("objects:", objects)
-    if objects is None:
-        return []
-    object_list = objects if isinstance(objects, list) else [objects]
-    result_meshes = []
-
-    def _recurse(current_obj):
-        if current_obj is None:
-            return
-        # DeformCache 우선 (옵션)
-        if deform:
-            deform_cache = current_obj.GetDeformCache()
-            if deform_cache is not None:
-                _recurse(deform_cache)
-                # 하위 오브젝트는 DeformCache 내부에서만 탐색
-                return
-        cache_obj = current_obj.GetCache()
-        if cache_obj is not None:
-            _recurse(cache_obj)
-        else:
-            if not current_obj.GetBit(c4d.BIT_CONTROLOBJECT): # 제너레이터로 생성된 오브젝트는 무시
-                if current_obj.IsInstanceOf(c4d.Opolygon):
-                    result_meshes.append(current_obj)
-        
-        # 하위 오브젝트 재귀
-        if children:
-            child_obj = current_obj.GetDown()
-            while child_obj is not None:
-                _recurse(child_obj)
-                child_obj = child_obj.GetNext()
+    return list(IterFullCache(objects, parent, deform, children))
 
-    for root_obj in object_list:
-        if parent:
-            _recurse(root_obj)
+def _typed_buffer(buf, count, components, write=False):
+    """
+    태그 버퍼를 float 배열 memoryview 로 (Tag buffer as a flat 'd' / 'f' memoryview, by bytes per component)
+    """
+    view = memoryview(buf).cast("B")
+    if not count:
+        return None
+    fmt = {8: "d", 4: "f"}.get(view.nbytes // (count * components))
+    return view.cast(fmt) if fmt else None
+
+_NUMPY_TYPES = {"d": "float64", "f": "float32", "i": "int32"}
+
+def _matrix_row(mg):
+    """
+    매트릭스를 평탄한 12 개의 float 튜플로 (c4d.Matrix -> (off, v1, v2, v3) flattened to 12 floats)
+    """
+    return (mg.off.x, mg.off.y, mg.off.z, mg.v1.x, mg.v1.y, mg.v1.z,
+            mg.v2.x, mg.v2.y, mg.v2.z, mg.v3.x, mg.v3.y, mg.v3.z)
+
+MERGE_BATCH_POINTS = 4096 # 이하의 메쉬는 한 번에 변환, 큰 메쉬는 메쉬마다 행렬곱 (smaller parts are transformed together)
+
+def _merge_numpy(parts, out_points, out_polys, out_uvs):
+    """
+    모든 메쉬를 출력 버퍼마다 한 번에 씁니다 (One vectorized pass per output buffer: large parts are transformed
+    with one matrix product each, all small parts together with their matrices gathered per point)
+    """
+    point_counts = np.array([len(points) // 3 for _, points, _, _ in parts])
+    poly_counts = np.array([len(polys) // 4 for _, _, polys, _ in parts])
+    point_ends = np.cumsum(point_counts)
+
+    pts = np.concatenate([np.frombuffer(points, dtype=_NUMPY_TYPES[points.format]) for _, points, _, _ in parts])
+    pts = pts.astype(np.float64, copy=False).reshape(-1, 3)
+    rows = np.array([_matrix_row(mg) for mg, _, _, _ in parts], dtype=np.float64).reshape(-1, 4, 3)
+    world = np.frombuffer(out_points, dtype=_NUMPY_TYPES[out_points.format]).reshape(-1, 3)
+
+    large = point_counts > MERGE_BATCH_POINTS
+    for part in np.flatnonzero(large):
+        start, end = point_ends[part] - point_counts[part], point_ends[part]
+        world[start:end] = pts[start:end] @ rows[part, 1:] + rows[part, 0]
+    if not large.all():
+        part_of_point = np.repeat(np.arange(len(parts)), point_counts)
+        small = ~large[part_of_point]
+        part_of_point = part_of_point[small]
+        world[small] = rows[part_of_point, 0] + np.einsum("ni,nij->nj", pts[small], rows[part_of_point, 1:])
+
+    indices = np.concatenate([np.frombuffer(polys, dtype=np.int32) for _, _, polys, _ in parts])
+    np.frombuffer(out_polys, dtype=np.int32)[:] = indices + np.repeat(point_ends - point_counts, poly_counts * 4)
+
+    if out_uvs is not None:
+        uv_type = _NUMPY_TYPES[out_uvs.format]
+        np.frombuffer(out_uvs, dtype=uv_type)[:] = np.concatenate([
+            np.frombuffer(uvs, dtype=_NUMPY_TYPES[uvs.format]) if uvs is not None else np.zeros(count * 12, uv_type)
+            for (_, _, _, uvs), count in zip(parts, poly_counts)])
+
+def _merge_python(parts, out_points, out_polys, out_uvs):
+    """
+    numpy 없이 같은 작업 (Same as _merge_numpy without numpy: interleaved xyz per part into one array,
+    int.__add__ map / frombytes for indices and UVs, one write per output buffer)
+    """
+    coords = array.array(out_points.format)
+    for mg, points, _, _ in parts:
+        ox, oy, oz, ax, ay, az, bx, by, bz, cx, cy, cz = _matrix_row(mg)
+        coords.extend([value for x, y, z in zip(points[0::3], points[1::3], points[2::3])
+                        for value in (ox + x * ax + y * bx + z * cx, oy + x * ay + y * by + z * cy, oz + x * az + y * bz + z * cz)])
+    out_points[:] = coords
+
+    indices = array.array("i")
+    point_offset = 0
+    for _, points, polys, _ in parts:
+        if point_offset:
+            indices.extend(map(point_offset.__add__, polys))
         else:
-            # parent=False면 하위만 탐색
-            if children:
-                child_obj = root_obj.GetDown()
-                while child_obj is not None:
-                    _recurse(child_obj)
-                    child_obj = child_obj.GetNext()
-    return result_meshes
+            indices.frombytes(polys.cast("B"))
+        point_offset += len(points) // 3
+    out_polys[:] = indices
+
+    if out_uvs is not None:
+        uv_values = array.array(out_uvs.format)
+        for _, _, polys, uvs in parts:
+            if uvs is None:
+                uv_values.frombytes(bytes(len(polys) * 3 * uv_values.itemsize)) # 폴리곤당 12 개의 0
+            elif uvs.format == out_uvs.format:
+                uv_values.frombytes(uvs.cast("B"))
+            else:
+                uv_values.extend(uvs)
+        out_uvs[:] = uv_values
+
+def MergeObjects(objects, deform=True, uvw=True, name="Merged"):
+    """
+    GetFullCache 결과 메쉬들을 하나의 PolygonObject 로 합칩니다. 문서를 수정하지 않고 (Join/언도 없음),
+    포인트/폴리곤/UVW 버퍼를 미리 할당한 배열에 한 번에 씁니다. 포인트는 글로벌 좌표로 변환됩니다.
+    (Merges the final cache meshes of the inputs into one new PolygonObject without touching the document:
+    no clones, no temporary nulls, no Join command, no undo. Points / polygons / UVWs are read from the raw tag
+    buffers, transformed by each mesh's global matrix in bulk and written into preallocated buffers.
+    Selection, normal and other tags are not merged.)
+
+    :param objects: 오브젝트 또는 오브젝트 리스트 :type objects: c4d.BaseObject | list[c4d.BaseObject]
+    :param deform: DeformCache 사용 여부 :type deform: bool
+    :param uvw: UVW 태그도 합칠지 여부 (UVW 가 없는 메쉬는 0) :type uvw: bool
+    :return: 문서에 삽입되지 않은 PolygonObject, 메쉬가 없으면 None :rtype: c4d.PolygonObject | None
+    """
+    parts = []
+    for mesh in IterFullCache(objects, deform=deform):
+        point_count, poly_count = mesh.GetPointCount(), mesh.GetPolygonCount()
+        point_tag, poly_tag = mesh.GetTag(c4d.Tpoint), mesh.GetTag(c4d.Tpolygon)
+        if not point_count or not poly_count or point_tag is None or poly_tag is None:
+            continue
+        points = _typed_buffer(point_tag.GetLowlevelDataAddressR(), point_count, 3)
+        polys = memoryview(poly_tag.GetLowlevelDataAddressR()).cast("B").cast("i")
+        if points is None or len(polys) != poly_count * 4:
+            continue
+        uvs = None
+        uvw_tag = mesh.GetTag(c4d.Tuvw) if uvw else None
+        if uvw_tag is not None:
+            uvs = _typed_buffer(uvw_tag.GetLowlevelDataAddressR(), poly_count, 12)
+        parts.append((mesh.GetMg(), points, polys, uvs))
+    if not parts:
+        return None
+
+    total_points = sum(len(points) // 3 for _, points, _, _ in parts)
+    total_polys = sum(len(polys) // 4 for _, _, polys, _ in parts)
+    result = c4d.PolygonObject(total_points, total_polys)
+    result.SetName(name)
+    out_points = _typed_buffer(result.GetTag(c4d.Tpoint).GetLowlevelDataAddressW(), total_points, 3)
+    out_polys = memoryview(result.GetTag(c4d.Tpolygon).GetLowlevelDataAddressW()).cast("B").cast("i")
+
+    out_uvs = None
+    if any(uvs is not None for _, _, _, uvs in parts):
+        uvw_tag = c4d.UVWTag(total_polys)
+        result.InsertTag(uvw_tag)
+        out_uvs = _typed_buffer(uvw_tag.GetLowlevelDataAddressW(), total_polys, 12)
+
+    (_merge_numpy if np is not None else _merge_python)(parts, out_points, out_polys, out_uvs)
+    result.Message(c4d.MSG_UPDATE)
+    return result
 
 def GetMergedObject(self, op, doc): #Deprecated
-    """Create a merged clone of all input objects in a dummy document and return that merged object."""
+    """Create a merged clone of all input objects in a dummy document and return that merged object. (Deprecated: use MergeObjects)"""
     null = c4d.BaseObject(c4d.Onull)
 
     for node in op:
@@ -153,9 +535,41 @@ def GetMergedObject(self, op, doc): #Deprecated
     return joinResult
 
 
-def SelectObjects(objects, doc):
-    c4d.CallCommand(12113)  # Deselect All
-    for obj in objects:
+def SelectObjects(objects, doc, mode=c4d.SELECTION_NEW):
+    """
+    오브젝트들을 한 번에 선택합니다. 현재 선택과의 차이(delta)만 BIT_ACTIVE 로 바꾸고,
+    언도 하나(StartUndo/EndUndo)와 EventAdd 한 번으로 처리합니다.
+    (Bulk selection: only objects whose state actually changes are touched, BIT_ACTIVE is set/cleared directly,
+    all inside one undo step, followed by a single EventAdd. Scales linearly with the scene size.)
+
+    :param objects: 선택할 오브젝트들 :type objects: list[c4d.BaseObject]
+    :param doc: 문서 :type doc: c4d.documents.BaseDocument
+    :param mode: SELECTION_NEW (기존 선택 해제), SELECTION_ADD, SELECTION_SUB :type mode: int
+    :return: 상태가 바뀐 오브젝트 수 :rtype: int
+    """
+    targets = dict.fromkeys(obj for obj in objects if obj is not None) # 순서 유지 + 중복 제거
+    if mode == c4d.SELECTION_SUB:
+        select = []
+        deselect = [obj for obj in targets if obj.GetBit(c4d.BIT_ACTIVE)]
+    else:
+        select = [obj for obj in targets if not obj.GetBit(c4d.BIT_ACTIVE)]
+        deselect = []
+        if mode == c4d.SELECTION_NEW:
+            deselect = [obj for obj in IterAllObjects(doc, bits=c4d.BIT_ACTIVE) if obj not in targets]
+    if not select and not deselect:
+        return 0
+
+    doc.StartUndo()
+    for obj in deselect:
         doc.AddUndo(c4d.UNDOTYPE_BITS, obj)  # 언도 추가
-        doc.SetSelection(obj , mode=c4d.SELECTION_ADD)
-    c4d.EventAdd()  # 뷰포트 업데이트
\ No newline at end of file
+        obj.DelBit(c4d.BIT_ACTIVE)
+    for obj in select:
+        doc.AddUndo(c4d.UNDOTYPE_BITS, obj)
+        obj.SetBit(c4d.BIT_ACTIVE)
+    if select:
+        # 첫 번째 새 선택을 활성 오브젝트로 (Attribute Manager 가 따라오도록, SetSelection 과 동일)
+        # SELECTION_ADD: 위에서 정한 선택은 그대로 두고 활성 오브젝트만 바꿉니다. 비트 언도는 위에서 기록됨.
+        doc.SetActiveObject(select[0], c4d.SELECTION_ADD)
+    doc.EndUndo()
+    c4d.EventAdd()  # 뷰포트 업데이트
+    return len(select) + len(deselect)
@@ -93,6 +93,14 @@ TRIPLANAR_PROJ_S_Z = 1002
 # Triplanar Ports
 TRIPTEX_TEXTURE1 = 1000 # Input Texture
 
+# Float / RGB Spectrum Texture Ports (inferred, checked against the shader description before writing)
+FLOATTEXTURE_VALUE = 1000
+RGBSPECTRUM_COLOR = 1000
+
+# Tile tokens (Mari 1001 / Mudbox u1_v1)
+OCT_UDIM_TOKEN = "<UDIM>"
+OCT_UVTILE_TOKEN = "<UVTILE>"
+
 # --- Texture Channels (Reused from redshift_utils) ---
 TEXTURE_CHANNELS = {
     "base_color":        ["basecolor", "base", "color", "albedo", "diffuse", "diff", "col", "bc", "alb", "rgb" , "d", "dif"],
@@ -109,11 +117,14 @@ TEXTURE_CHANNELS = {
     "emission_color":    ["emissive", "emission", "emit", "illu", "illumination", "selfillum", "e"]
 }
 
+TILE_NUMBER_PATTERN = re.compile(r"<(UDIM|UVTILE)>|(?<=[._])u\d+_v\d+(?=[._]|$)", re.IGNORECASE)
+
 def _split_into_components(fname):
     """
     Split filename into components for channel detection.
     """
     fname = os.path.splitext(fname)[0]
+    fname = TILE_NUMBER_PATTERN.sub("", fname)
     fname = "".join(i for i in fname if not i.isdigit())
     separators = [" ", ".", "-", "__", "--", "#"]
     for sep in separators:
@@ -133,6 +144,11 @@ def GetTextureChannel(fname):
                 return channel
     return None
 
+def GetTextureSetAndChannel(fname):
+    """Returns (set prefix, channel) of a file name, used to classify files in the texture catalog."""
+    components = _split_into_components(fname)
+    return (components[0] if components else None), GetTextureChannel(fname)
+
 # --- Helper Functions (Ported from OctaneHelper) ---
 
 def CreateOctaneMaterial(doc=None, name="Octane Standard Surface"):
@@ -326,3 +342,175 @@ def SetupTextures(material, tex_data):
     except Exception as e:
         print(f"Error in SetupTextures: {e}")
         raise RuntimeError("Unable to setup texture")
+
+
+def GetAllShaders(material):
+    """Returns every shader in the material's shader tree (iterative walk)."""
+    shaders = []
+    if not material:
+        return shaders
+
+    shader = material.GetFirstShader()
+    stack = []
+    while shader or stack:
+        if not shader:
+            shader = stack.pop()
+            continue
+        shaders.append(shader)
+        if shader.GetDown():
+            stack.append(shader.GetNext())
+            shader = shader.GetDown()
+        else:
+            shader = shader.GetNext()
+    return shaders
+
+def ReplaceShaderLinks(material, old_shader, new_shader):
+    """
+    Points every link parameter of the material and its shaders that references old_shader to new_shader.
+    Links are found through the descriptions, so no port IDs have to be known. Returns the number of links changed.
+    """
+    count = 0
+    for node in [material] + GetAllShaders(material):
+        if node == old_shader:
+            continue
+        description = node.GetDescription(c4d.DESCFLAGS_DESC_NONE)
+        if not description:
+            continue
+        for bc, paramid, groupid in description:
+            if paramid[0].dtype != c4d.DTYPE_BASELISTLINK:
+                continue
+            try:
+                if node[paramid] == old_shader:
+                    node[paramid] = new_shader
+                    count += 1
+            except (AttributeError, TypeError):
+                pass
+    return count
+
+def SetCheckedParameter(node, param_id, value, dtypes):
+    """
+    Writes a parameter whose ID is not confirmed by the SDK: it must be in the node's description with
+    one of the given data types, and the value must read back. Raises RuntimeError otherwise.
+    """
+    dtype = None
+    description = node.GetDescription(c4d.DESCFLAGS_DESC_NONE)
+    if description:
+        for bc, paramid, groupid in description:
+            if paramid[0].id == param_id:
+                dtype = paramid[0].dtype
+                break
+    if dtype not in dtypes:
+        raise RuntimeError(f"{node.GetName()} has no parameter {param_id} of the expected type")
+
+    node[param_id] = value
+    stored = node[param_id]
+    if isinstance(value, c4d.Vector):
+        matches = isinstance(stored, c4d.Vector) and (stored - value).GetLength() <= 1e-4
+    else:
+        matches = isinstance(stored, (int, float)) and abs(stored - value) <= 1e-4
+    if not matches:
+        raise RuntimeError(f"{node.GetName()} did not keep the value written to parameter {param_id}")
+
+def ReplaceTextureWithConstant(material, tex_shader, rgba):
+    """
+    Replaces an Image Texture shader by a Float Texture (float mode) or RGB Spectrum holding its constant value.
+    rgba is the value stored in the file (0-1); gamma, invert and power of the shader are applied.
+    Returns the new shader, or None if the texture wasn't linked anywhere.
+    Raises RuntimeError, with the texture untouched, if the constant shader doesn't take the value.
+    """
+    gamma = tex_shader[IMAGETEXTURE_GAMMA] or 1.0
+    power = tex_shader[IMAGETEXTURE_POWER]
+    power = 1.0 if power is None else power
+    values = []
+    for v in rgba[:3]:
+        v = v ** gamma
+        if tex_shader[IMAGETEXTURE_INVERT]:
+            v = 1.0 - v
+        values.append(v * power)
+
+    if tex_shader[IMAGETEXTURE_MODE] == 1: # Float
+        const_shader = c4d.BaseList2D(ID_OCT_FLOAT_TEXTURE)
+        const_shader.SetName(tex_shader.GetName())
+        SetCheckedParameter(const_shader, FLOATTEXTURE_VALUE, sum(values) / 3.0, (c4d.DTYPE_REAL,))
+    else:
+        const_shader = c4d.BaseList2D(ID_OCT_RGBSPECTRUM)
+        const_shader.SetName(tex_shader.GetName())
+        SetCheckedParameter(const_shader, RGBSPECTRUM_COLOR, c4d.Vector(*values), (c4d.DTYPE_COLOR, c4d.DTYPE_VECTOR))
+
+    if not ReplaceShaderLinks(material, tex_shader, const_shader):
+        return None
+    AddShaderToMaterial(material, const_shader)
+    tex_shader.Remove()
+    return const_shader
+
+def GetImageTextureShaders(material):
+    """
+    Returns all Image Texture shaders in the material's shader tree.
+    """
+    return [shader for shader in GetAllShaders(material) if shader.CheckType(ID_OCT_IMAGE_TEXTURE)]
+
+# --- PBR Material Templates ---
+# SetupTextures is run once per channel combination on a material in a private document.
+# New materials are cloned from it and only get their texture paths patched.
+
+# Node names given by SetupTextures -> channel
+TEMPLATE_NODE_CHANNELS = {
+    "Albedo": "base_color",
+    "AO": "ao",
+    "Roughness": "refl_roughness",
+    "Glossiness": "glossiness",
+    "Metalness": "metalness",
+    "Specular": "refl_weight",
+    "Normal": "normal",
+    "Bump": "bump",
+    "Displacement": "displacement",
+    "Opacity": "opacity_color",
+    "Emission": "emission_color",
+}
+
+_TEMPLATE_DOC = None
+_PBR_TEMPLATES = {}
+
+def GetPBRTemplate(channels):
+    """
+    Returns the cached template material for the given channel combination, building it on first use.
+    """
+    global _TEMPLATE_DOC
+
+    key = tuple(sorted(c for c in channels if c in TEMPLATE_NODE_CHANNELS.values()))
+    template = _PBR_TEMPLATES.get(key)
+    if template is not None and template.IsAlive():
+        return template
+
+    if _TEMPLATE_DOC is None:
+        _TEMPLATE_DOC = c4d.documents.BaseDocument()
+
+    template = CreateOctaneMaterial(_TEMPLATE_DOC, "PBR Template")
+    SetupTextures(template, {channel: "" for channel in key})
+    _PBR_TEMPLATES[key] = template
+    return template
+
+def CreateMaterialFromTemplate(doc, tex_data, name):
+    """
+    Creates a PBR material by cloning the cached template and patching the texture paths.
+    Same result as CreateOctaneMaterial + SetupTextures, without rebuilding the shader tree.
+    """
+    template = GetPBRTemplate(tex_data.keys())
+
+    # AliasTrans re-targets the shader links to the cloned shaders
+    trans = c4d.AliasTrans()
+    if not trans or not trans.Init(doc):
+        mat = CreateOctaneMaterial(doc, name)
+        SetupTextures(mat, tex_data)
+        return mat
+
+    mat = template.GetClone(c4d.COPYFLAGS_NONE, trans)
+    mat.SetName(name)
+    doc.InsertMaterial(mat)
+    trans.Translate(True)
+
+    for shader in GetImageTextureShaders(mat):
+        channel = TEMPLATE_NODE_CHANNELS.get(shader.GetName())
+        if channel in tex_data:
+            shader[IMAGETEXTURE_FILE] = tex_data[channel]
+    return mat
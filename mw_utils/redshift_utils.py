@@ -3,6 +3,13 @@ import maxon
 import os
 import re
 
+try:
+    from . import texture_utils
+    from . import image_utils
+except ImportError:
+    import texture_utils
+    import image_utils
+
 # --- Constants & Node IDs ---
 ID_RS_NODESPACE = maxon.Id("com.redshift3d.redshift4c4d.class.nodespace")
 ID_RS_STANDARD_MATERIAL = maxon.Id("com.redshift3d.redshift4c4d.nodes.core.standardmaterial")
@@ -19,6 +26,7 @@ ID_RS_TRIPLANAR = maxon.Id("com.redshift3d.redshift4c4d.nodes.core.triplanar")
 ID_RS_MATH_INVERT = maxon.Id("com.redshift3d.redshift4c4d.nodes.core.rsmathinv")
 
 ID_RS_COLOR_CORRECT = maxon.Id("com.redshift3d.redshift4c4d.nodes.core.rscolorcorrection")
+ID_RS_COLOR_SPLITTER = maxon.Id("com.redshift3d.redshift4c4d.nodes.core.rscolorsplitter")
 
 # Port IDs
 PORT_RS_STD_BASE_COLOR = "com.redshift3d.redshift4c4d.nodes.core.standardmaterial.base_color"
@@ -34,6 +42,12 @@ PORT_RS_TEX_SCALE = "com.redshift3d.redshift4c4d.nodes.core.texturesampler.scale
 PORT_RS_TEX_OFFSET = "com.redshift3d.redshift4c4d.nodes.core.texturesampler.offset"
 PORT_RS_TEX_ROTATE = "com.redshift3d.redshift4c4d.nodes.core.texturesampler.rotate"
 PORT_RS_TEX_OUTCOLOR = "com.redshift3d.redshift4c4d.nodes.core.texturesampler.outcolor"
+
+# Color Splitter Ports (inferred)
+PORT_RS_SPLITTER_INPUT = "com.redshift3d.redshift4c4d.nodes.core.rscolorsplitter.input"
+PORT_RS_SPLITTER_OUT_R = "com.redshift3d.redshift4c4d.nodes.core.rscolorsplitter.outr"
+PORT_RS_SPLITTER_OUT_G = "com.redshift3d.redshift4c4d.nodes.core.rscolorsplitter.outg"
+PORT_RS_SPLITTER_OUT_B = "com.redshift3d.redshift4c4d.nodes.core.rscolorsplitter.outb"
 PORT_RS_TEX_UV_CONTEXT = "com.redshift3d.redshift4c4d.nodes.core.texturesampler.uv_context"
 
 PORT_RS_TRI_IMAGE_X = "com.redshift3d.redshift4c4d.nodes.core.triplanar.imagex"
@@ -76,16 +90,34 @@ PORT_RS_OUTPUT_SURFACE = "com.redshift3d.redshift4c4d.node.output.surface"
 # Colorspace
 RS_INPUT_COLORSPACE_RAW = "RS_INPUT_COLORSPACE_RAW"
 
+# Tile tokens (Mari 1001 / Mudbox u1_v1)
+RS_UDIM_TOKEN = "<UDIM>"
+RS_UVTILE_TOKEN = "<UVTILE>"
+
+# Channels that carry color data. Everything else is loaded with RAW colorspace.
+COLOR_CHANNELS = ["base_color", "emission_color", "opacity_color", "translucency"]
+
 def create_texture_node(graph, texture_path):
     """Creates a Texture Sampler node and sets the path."""
     tex_node = graph.AddChild(maxon.Id(), ID_RS_TEXTURESAMPLER)
-    
-    # Set Texture Path
-    path_port = tex_node.GetInputs().FindChild(PORT_RS_TEX_PATH).FindChild("path")
+    set_texture_path(tex_node, texture_path)
+    return tex_node
+
+def get_texture_path(node):
+    """Returns the tex0 path of a Texture Sampler node as a string ("" if unset)."""
+    path_port = node.GetInputs().FindChild(PORT_RS_TEX_PATH).FindChild("path")
+    if not path_port.IsValid():
+        return ""
+    val = path_port.GetPortValue()
+    if not val:
+        return ""
+    return val.GetSystemPath() if isinstance(val, maxon.Url) else str(val)
+
+def set_texture_path(node, texture_path):
+    """Sets the tex0 path of a Texture Sampler node. Must be called inside a transaction."""
+    path_port = node.GetInputs().FindChild(PORT_RS_TEX_PATH).FindChild("path")
     if path_port.IsValid():
         path_port.SetPortValue(texture_path)
-    
-    return tex_node
 
 def find_standard_material_and_output(graph):
     """Finds the Standard Material and Output node in the graph."""
@@ -183,6 +215,8 @@ TEXTURE_CHANNELS = {
     ]
 }
 
+TILE_NUMBER_PATTERN = re.compile(r"<(UDIM|UVTILE)>|(?<=[._])u\d+_v\d+(?=[._]|$)", re.IGNORECASE)
+
 def _split_into_components(fname):
     """
     Split filename into components for channel detection.
@@ -192,6 +226,9 @@ def _split_into_components(fname):
     # Remove extension
     fname = os.path.splitext(fname)[0]
 
+    # Remove UDIM / UV tile tokens and Mudbox tile numbers (<UDIM>, <UVTILE>, _u1_v1)
+    fname = TILE_NUMBER_PATTERN.sub("", fname)
+
     # Remove digits
     fname = "".join(i for i in fname if not i.isdigit())
 
@@ -219,6 +256,27 @@ def GetTextureChannel(fname):
             
     return None
 
+def GetTextureSetAndChannel(fname):
+    """Returns (set prefix, channel) of a file name, used to classify files in the texture catalog."""
+    components = _split_into_components(fname)
+    return (components[0] if components else None), GetTextureChannel(fname)
+
+def GetTextureSetName(fname):
+    """
+    Set prefix of a file name: the name with only the channel token removed
+    (Wood_Oak_AO.png -> Wood_Oak), so sets sharing a first word do not collide.
+    """
+    stem = TILE_NUMBER_PATTERN.sub("", os.path.splitext(os.path.basename(fname))[0])
+    parts = re.split(r"([ ._\-#]+)", stem) # words at even, separators at odd indices
+
+    # Same match order as GetTextureChannel: the last word that is a channel keyword
+    for i in range(len(parts) - 1, -1, -2):
+        word = "".join(c for c in parts[i] if not c.isdigit()).lower()
+        if any(word in keywords for keywords in TEXTURE_CHANNELS.values()):
+            del parts[max(i - 1, 0):i + 1] # the word and its leading separator
+            break
+    return "".join(parts).strip(" ._-#")
+
 def set_colorspace_raw(node):
     """
     Sets the colorspace of a texture node to RAW.
@@ -228,3 +286,480 @@ def set_colorspace_raw(node):
         colorspace_port = tex0_port.FindChild("colorspace")
         if colorspace_port.IsValid():
             colorspace_port.SetPortValue(RS_INPUT_COLORSPACE_RAW)
+
+def get_colorspace(node):
+    """Returns the tex0 colorspace of a Texture Sampler node ("" if unset)."""
+    tex0_port = node.GetInputs().FindChild(PORT_RS_TEX_PATH)
+    if tex0_port.IsValid():
+        colorspace_port = tex0_port.FindChild("colorspace")
+        if colorspace_port.IsValid():
+            return str(colorspace_port.GetPortValue() or "")
+    return ""
+
+def reads_srgb(node, abs_path=None):
+    """
+    True if the sampler decodes its file as sRGB: an sRGB colorspace, or auto (unset) on an integer image.
+    Auto reads float files (EXR / HDR / 32-bit) as linear; every other colorspace is treated as linear.
+    """
+    colorspace = get_colorspace(node).lower()
+    if colorspace in ("", "auto", "rs_input_colorspace_auto"):
+        path = abs_path or get_texture_path(node)
+        try:
+            header = texture_utils.ReadImageHeader(path)
+            return header.format not in ("EXR", "HDR") and header.bits < 32
+        except (OSError, ValueError, ImportError):
+            return os.path.splitext(path)[1].lower() not in (".exr", ".hdr")
+    return "srgb" in colorspace and "linear" not in colorspace
+
+def _srgb_to_linear(v):
+    return v / 12.92 if v <= 0.04045 else ((v + 0.055) / 1.055) ** 2.4
+
+def _typed_port_value(port, rgba):
+    """Converts an (r, g, b, a) tuple to the data type of the given input port."""
+    r, g, b, a = rgba
+    default = port.GetDefaultValue()
+    if isinstance(default, (maxon.ColorA, maxon.ColorA32)):
+        return maxon.ColorA(r, g, b, a)
+    if isinstance(default, (maxon.Color, maxon.Color32)):
+        return maxon.Color(r, g, b)
+    if isinstance(default, (maxon.Vector, maxon.Vector32)):
+        return maxon.Vector(r, g, b)
+    return (r + g + b) / 3.0
+
+def replace_sampler_with_constant(tex_node, rgba, abs_path=None):
+    """
+    Writes the constant color of a Texture Sampler into every port it feeds and removes the sampler.
+    rgba is the value stored in abs_path (0-1); it is linearized only if the sampler reads the file as sRGB.
+    Returns the number of ports that received the constant. Must be called inside a transaction.
+    """
+    r, g, b, a = rgba
+    if reads_srgb(tex_node, abs_path):
+        r, g, b = _srgb_to_linear(r), _srgb_to_linear(g), _srgb_to_linear(b)
+
+    targets = []
+    for out_port in tex_node.GetOutputs().GetChildren():
+        connections = []
+        out_port.GetConnections(maxon.PORT_DIR.OUTPUT, connections)
+        is_alpha = out_port.GetId().ToString().lower().endswith("alpha")
+        for connection in connections:
+            targets.append((out_port, connection[0], (a, a, a, a) if is_alpha else (r, g, b, a)))
+
+    for out_port, in_port, value in targets:
+        maxon.GraphModelHelper.RemoveConnection(out_port, in_port)
+        in_port.SetPortValue(_typed_port_value(in_port, value))
+
+    tex_node.Remove()
+    return len(targets)
+
+def get_texture_samplers(graph):
+    """Returns all Texture Sampler nodes of a graph."""
+    root = graph.GetRoot()
+    return [node for node in root.GetInnerNodes(mask=maxon.NODE_KIND.NODE, includeThis=False)
+            if node.GetValue("net.maxon.node.attribute.assetid")[0] == ID_RS_TEXTURESAMPLER]
+
+def get_material_texture_samplers(mat):
+    """Returns (graph, [sampler nodes]) of a Redshift node material, or (None, []) for other materials."""
+    node_mat = mat.GetNodeMaterialReference()
+    if not node_mat.HasSpace(ID_RS_NODESPACE):
+        return None, []
+    graph = node_mat.GetGraph(ID_RS_NODESPACE)
+    if graph.IsNullValue():
+        return None, []
+    return graph, get_texture_samplers(graph)
+
+def get_all_texture_samplers(doc):
+    """Returns [(material, graph, sampler node), ...] for every Redshift node material of the document."""
+    result = []
+    for mat in doc.GetMaterials():
+        graph, nodes = get_material_texture_samplers(mat)
+        result.extend((mat, graph, node) for node in nodes)
+    return result
+
+def find_samplers_by_channel(graph):
+    """Returns {channel: [sampler nodes]} for all Texture Samplers of the graph, classified by file name."""
+    samplers = {}
+    for node in get_texture_samplers(graph):
+        channel = GetTextureChannel(os.path.basename(get_texture_path(node)))
+        if channel:
+            samplers.setdefault(channel, []).append(node)
+    return samplers
+
+def _redirect_outputs(old_node, new_out_port):
+    """Connects new_out_port to every port old_node fed. Returns the number of rewired ports."""
+    if new_out_port is None or not new_out_port.IsValid():
+        raise RuntimeError(f"Invalid output port; {old_node.GetId().ToString()} was left connected.")
+    count = 0
+    for out_port in old_node.GetOutputs().GetChildren():
+        connections = []
+        out_port.GetConnections(maxon.PORT_DIR.OUTPUT, connections)
+        for connection in connections:
+            in_port = connection[0]
+            maxon.GraphModelHelper.RemoveConnection(out_port, in_port)
+            new_out_port.Connect(in_port)
+            count += 1
+    return count
+
+def _sampler_signature(node):
+    """
+    Key of everything that determines a sampler's result: all input port values (path, colorspace,
+    UV scale / offset / rotation, ...) and the source of every connected input (e.g. projection nodes).
+    """
+    signature = []
+    stack = list(node.GetInputs().GetChildren())
+    while stack:
+        port = stack.pop()
+        stack.extend(port.GetChildren())
+
+        connections = []
+        port.GetConnections(maxon.PORT_DIR.INPUT, connections)
+        sources = []
+        for connection in connections:
+            source = connection[0]
+            source_node = source.GetAncestor(maxon.NODE_KIND.NODE)
+            sources.append((source_node.GetId().ToString(), source.GetId().ToString()))
+
+        value = port.GetPortValue()
+        signature.append((port.GetId().ToString(), str(value) if value is not None else "", tuple(sorted(sources))))
+    return tuple(sorted(signature))
+
+def merge_duplicate_samplers(graph):
+    """
+    Merges Texture Samplers with identical inputs into one node whose outputs fan out to all former consumers.
+    Only samplers with the same parent node are merged: a connection must not cross a group boundary,
+    and input sources are compared by node id, which is only unique within one parent.
+    Must be called inside a transaction. Returns the number of removed samplers.
+    """
+    groups = {}
+    for node in get_texture_samplers(graph):
+        parent = str(node.GetParent().GetPath())
+        groups.setdefault((parent, _sampler_signature(node)), []).append(node)
+
+    removed = 0
+    for nodes in groups.values():
+        keep = nodes[0]
+        for node in nodes[1:]:
+            for out_port in node.GetOutputs().GetChildren():
+                keep_port = keep.GetOutputs().FindChild(out_port.GetId().ToString())
+                connections = []
+                out_port.GetConnections(maxon.PORT_DIR.OUTPUT, connections)
+                for connection in connections:
+                    maxon.GraphModelHelper.RemoveConnection(out_port, connection[0])
+                    keep_port.Connect(connection[0])
+            node.Remove()
+            removed += 1
+    return removed
+
+ORM_CHANNELS = ("ao", "refl_roughness", "metalness") # R, G, B
+
+def pack_orm_samplers(graph, channel_nodes, orm_path):
+    """
+    Replaces the AO / Roughness / Metalness samplers in channel_nodes by one RAW sampler reading orm_path
+    and a Color Splitter whose R / G / B outputs feed the ports the old samplers fed.
+    Must be called inside a transaction; raises RuntimeError before any connection is touched
+    if a Color Splitter port is missing, so the uncommitted transaction leaves the graph as it was.
+    Returns the created nodes.
+    """
+    splitter = graph.AddChild(maxon.Id(), ID_RS_COLOR_SPLITTER)
+    split_in = splitter.GetInputs().FindChild(PORT_RS_SPLITTER_INPUT)
+    split_ports = (PORT_RS_SPLITTER_OUT_R, PORT_RS_SPLITTER_OUT_G, PORT_RS_SPLITTER_OUT_B)
+    out_ports = {}
+    for channel, port_id in zip(ORM_CHANNELS, split_ports):
+        if channel not in channel_nodes:
+            continue
+        out_port = splitter.GetOutputs().FindChild(port_id)
+        if not out_port.IsValid():
+            raise RuntimeError(f"Color Splitter has no output port '{port_id}'. ORM pack aborted.")
+        out_ports[channel] = out_port
+    if not split_in.IsValid():
+        raise RuntimeError(f"Color Splitter has no input port '{PORT_RS_SPLITTER_INPUT}'. ORM pack aborted.")
+
+    orm_node = create_texture_node(graph, orm_path)
+    orm_node.SetValue("net.maxon.node.base.name", os.path.basename(orm_path))
+    set_colorspace_raw(orm_node)
+    tex_out = orm_node.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+    if tex_out.IsValid():
+        tex_out.Connect(split_in)
+
+    for channel, out_port in out_ports.items():
+        old_node = channel_nodes[channel]
+        _redirect_outputs(old_node, out_port)
+        old_node.Remove()
+
+    return [orm_node, splitter]
+
+def pack_orm_graph(doc, graph):
+    """
+    Packs the AO / Roughness / Metalness samplers of a graph into one ORM texture (at least two must exist).
+    <set>_ORM.png (set = file name without its channel token) is written next to the maps and reused while it is newer than its sources.
+    Returns the ORM path, or None if there was nothing to pack.
+    """
+    samplers = find_samplers_by_channel(graph)
+    channel_nodes = dict((c, samplers[c][0]) for c in ORM_CHANNELS if c in samplers)
+    if len(channel_nodes) < 2:
+        return None
+
+    paths = {}
+    for channel, node in channel_nodes.items():
+        path = texture_utils.ResolveTexturePath(doc, get_texture_path(node))
+        if not path or not os.path.isfile(path): # tiles / sequences are not packed
+            return None
+        paths[channel] = path
+
+    source_paths = [paths.get(c) for c in ORM_CHANNELS]
+    set_name = GetTextureSetName(next(p for p in source_paths if p)) or "Material"
+    orm_path = texture_utils.MakePackedTexturePath(source_paths, set_name)
+    if not texture_utils.IsPackedTextureCurrent(orm_path, source_paths):
+        image_utils.pack_orm(source_paths[0], source_paths[1], source_paths[2], orm_path)
+
+    with graph.BeginTransaction() as transaction:
+        pack_orm_samplers(graph, channel_nodes, orm_path)
+        transaction.Commit()
+    return orm_path
+
+def add_standard_material(graph, output_node):
+    """
+    Creates a Standard Material node and connects it to the Output surface port.
+    Must be called inside a transaction.
+    """
+    standard_mat = graph.AddChild(maxon.Id(), ID_RS_STANDARD_MATERIAL)
+    if output_node and standard_mat:
+        mat_out = standard_mat.GetOutputs().FindChild(PORT_RS_STD_OUTCOLOR)
+        surf_in = output_node.GetInputs().FindChild(PORT_RS_OUTPUT_SURFACE)
+        if mat_out and surf_in:
+            remove_connections(output_node, PORT_RS_OUTPUT_SURFACE)
+            mat_out.Connect(surf_in)
+    return standard_mat
+
+def _connect_to_port(out_port, node, port_id):
+    """Replaces whatever is connected to node.port_id with out_port."""
+    in_port = node.GetInputs().FindChild(port_id)
+    if out_port and in_port:
+        remove_connections(node, port_id)
+        out_port.Connect(in_port)
+
+def connect_pbr_textures(graph, standard_mat, output_node, channel_nodes):
+    """
+    Wires classified Texture Sampler nodes into the Standard Material and Output node.
+    channel_nodes maps a channel key to ONE sampler node. Normal/Bump and Roughness/Glossiness
+    conflicts must be resolved by the caller; if both are given, Normal and Roughness win.
+    Must be called inside a transaction. Returns the helper nodes that were created.
+    """
+    created_nodes = []
+
+    # --- A. Base Color & AO ---
+    tex_base = channel_nodes.get("base_color")
+    tex_ao = channel_nodes.get("ao")
+
+    if tex_base or tex_ao:
+        color_out = None
+        if tex_ao:
+            # Multiply Logic
+            mul_node = graph.AddChild(maxon.Id(), ID_RS_MATH_VECTOR_MULTIPLY)
+            created_nodes.append(mul_node)
+
+            # Connect AO -> Input 2
+            ao_out = tex_ao.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+            mul_in2 = mul_node.GetInputs().FindChild(PORT_RS_MATH_VECTOR_MULTIPLY_INPUT2)
+            if ao_out and mul_in2: ao_out.Connect(mul_in2)
+
+            if tex_base:
+                # Connect Base -> Input 1
+                base_out = tex_base.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+                mul_in1 = mul_node.GetInputs().FindChild(PORT_RS_MATH_VECTOR_MULTIPLY_INPUT1)
+                if base_out and mul_in1: base_out.Connect(mul_in1)
+                color_out = mul_node.GetOutputs().FindChild(PORT_RS_MATH_VECTOR_MULTIPLY_OUT)
+            # Only AO: Multiply is created but not connected to the material
+        else:
+            color_out = tex_base.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+
+        if color_out:
+            # Create Color Correct Node
+            cc_node = graph.AddChild(maxon.Id(), ID_RS_COLOR_CORRECT)
+            created_nodes.append(cc_node)
+            cc_node.SetValue("net.maxon.node.base.name", "Color Correct")
+
+            cc_in = cc_node.GetInputs().FindChild(PORT_RS_COLOR_CORRECT_INPUT)
+            if cc_in: color_out.Connect(cc_in)
+
+            # Connect Color Correct -> Material Base Color
+            cc_out = cc_node.GetOutputs().FindChild(PORT_RS_COLOR_CORRECT_OUT)
+            _connect_to_port(cc_out, standard_mat, PORT_RS_STD_BASE_COLOR)
+
+    # --- B. Normal & Bump ---
+    is_normal_map = "normal" in channel_nodes
+    chosen_bump_node = channel_nodes.get("normal") or channel_nodes.get("bump")
+
+    if chosen_bump_node:
+        bump_node = graph.AddChild(maxon.Id(), ID_RS_BUMPMAP)
+        created_nodes.append(bump_node)
+
+        # Set Type
+        bump_type_port = bump_node.GetInputs().FindChild(PORT_RS_BUMP_TYPE)
+        if bump_type_port:
+            # 1 = Tangent-Space Normal, 0 = Height Field
+            bump_type_port.SetPortValue(1 if is_normal_map else 0)
+
+        # Connect Texture -> Bump Node
+        tex_out = chosen_bump_node.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+        bump_in = bump_node.GetInputs().FindChild(PORT_RS_BUMP_INPUT)
+        if tex_out and bump_in: tex_out.Connect(bump_in)
+
+        # Connect Bump Node -> Material
+        bump_out = bump_node.GetOutputs().FindChild(PORT_RS_BUMP_OUT)
+        _connect_to_port(bump_out, standard_mat, PORT_RS_STD_BUMP_INPUT)
+
+    # --- C. Roughness & Glossiness ---
+    use_invert = "refl_roughness" not in channel_nodes
+    target_rough_node = channel_nodes.get("refl_roughness") or channel_nodes.get("glossiness")
+
+    if target_rough_node:
+        tex_out = target_rough_node.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+
+        if use_invert:
+            # Glossiness -> Invert -> Roughness
+            inv_node = graph.AddChild(maxon.Id(), ID_RS_MATH_INVERT)
+            created_nodes.append(inv_node)
+            inv_node.SetValue("net.maxon.node.base.name", "Invert Glossiness")
+
+            inv_in = inv_node.GetInputs().FindChild(PORT_RS_MATH_INVERT_INPUT)
+            if tex_out and inv_in: tex_out.Connect(inv_in)
+
+            inv_out = inv_node.GetOutputs().FindChild(PORT_RS_MATH_INVERT_OUTPUT)
+            if not inv_out: inv_out = inv_node.GetOutputs().FindChild("outColor")
+            _connect_to_port(inv_out, standard_mat, PORT_RS_STD_ROUGHNESS)
+        else:
+            # Direct Roughness
+            _connect_to_port(tex_out, standard_mat, PORT_RS_STD_ROUGHNESS)
+
+    # --- D. Other Simple Channels ---
+    simple_channels = [
+        ("metalness", PORT_RS_STD_METALNESS),
+        ("refl_weight", PORT_RS_STD_SPECULAR),
+        ("opacity_color", PORT_RS_STD_OPACITY),
+        ("emission_color", PORT_RS_STD_EMISSION),
+    ]
+    for channel, port_id in simple_channels:
+        tex_node = channel_nodes.get(channel)
+        if tex_node:
+            tex_out = tex_node.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+            _connect_to_port(tex_out, standard_mat, port_id)
+
+    # Displacement
+    tex_disp = channel_nodes.get("displacement")
+    if tex_disp and output_node:
+        disp_node = graph.AddChild(maxon.Id(), ID_RS_DISPLACEMENT)
+        created_nodes.append(disp_node)
+        disp_node.SetValue("net.maxon.node.base.name", "Displacement")
+
+        # Tex -> Disp
+        tex_out = tex_disp.GetOutputs().FindChild(PORT_RS_TEX_OUTCOLOR)
+        disp_in = disp_node.GetInputs().FindChild(PORT_RS_DISP_TEXMAP)
+        if tex_out and disp_in: tex_out.Connect(disp_in)
+
+        # Disp -> Output
+        disp_out = disp_node.GetOutputs().FindChild(PORT_RS_DISP_OUT)
+        _connect_to_port(disp_out, output_node, PORT_RS_OUTPUT_DISPLACEMENT)
+
+    return created_nodes
+
+
+# --- PBR Material Templates ---
+# The canonical PBR topology is built once per channel combination in a scratch document.
+# New materials are cloned from it and only get their texture paths and colorspaces patched.
+_TEMPLATE_DOC = None
+_PBR_TEMPLATES = {}
+
+def _template_sampler_id(channel):
+    return "mw.pbr.sampler." + channel
+
+def resolve_pbr_channels(channels):
+    """
+    Non-interactive conflict resolution for batch imports.
+    Normal wins over Bump, Roughness wins over Glossiness. Unknown keys are dropped.
+    """
+    resolved = set(c for c in channels if c in TEXTURE_CHANNELS)
+    if "normal" in resolved:
+        resolved.discard("bump")
+    if "refl_roughness" in resolved:
+        resolved.discard("glossiness")
+    return resolved
+
+def get_pbr_template(channels):
+    """
+    Returns the cached template material for the given channel combination, building it on first use.
+    The template lives in a private document and must not be inserted anywhere; clone it instead.
+    """
+    global _TEMPLATE_DOC
+
+    key = tuple(sorted(resolve_pbr_channels(channels)))
+    template = _PBR_TEMPLATES.get(key)
+    if template is not None and template.IsAlive():
+        return template
+
+    if _TEMPLATE_DOC is None:
+        _TEMPLATE_DOC = c4d.documents.BaseDocument()
+
+    mat = c4d.BaseMaterial(c4d.Mmaterial)
+    mat.SetName("PBR Template")
+    _TEMPLATE_DOC.InsertMaterial(mat)
+
+    nodeMaterial = mat.GetNodeMaterialReference()
+    graph = nodeMaterial.CreateDefaultGraph(ID_RS_NODESPACE)
+    if graph.IsNullValue():
+        raise RuntimeError("Unable to create Redshift template graph")
+
+    with graph.BeginTransaction() as transaction:
+        standard_mat, output_node = find_standard_material_and_output(graph)
+        if not output_node:
+            output_node = graph.AddChild(maxon.Id(), ID_RS_OUTPUT)
+        if not standard_mat:
+            standard_mat = add_standard_material(graph, output_node)
+
+        channel_nodes = {}
+        for channel in key:
+            tex_node = graph.AddChild(maxon.Id(_template_sampler_id(channel)), ID_RS_TEXTURESAMPLER)
+            tex_node.SetValue("net.maxon.node.base.name", channel)
+            if channel not in COLOR_CHANNELS:
+                set_colorspace_raw(tex_node)
+            channel_nodes[channel] = tex_node
+
+        connect_pbr_textures(graph, standard_mat, output_node, channel_nodes)
+        transaction.Commit()
+
+    _PBR_TEMPLATES[key] = mat
+    return mat
+
+def instantiate_pbr_template(doc, channel_paths, name=None):
+    """
+    Creates a new Redshift material from the cached template and inserts it into doc.
+    channel_paths maps a channel key to a texture path. Only texture paths and colorspaces
+    are patched on the clone, so the per-material cost does not depend on the graph size.
+    Existing materials are never overwritten with the template; they are set up node by node.
+    """
+    template = get_pbr_template(channel_paths.keys())
+    mat = template.GetClone(c4d.COPYFLAGS_NONE)
+    if name:
+        mat.SetName(name)
+    doc.InsertMaterial(mat)
+
+    graph = mat.GetNodeMaterialReference().GetGraph(ID_RS_NODESPACE)
+    if graph.IsNullValue():
+        return mat
+
+    samplers = {}
+    root = graph.GetRoot()
+    for node in root.GetInnerNodes(mask=maxon.NODE_KIND.NODE, includeThis=False):
+        samplers[node.GetId().ToString()] = node
+
+    with graph.BeginTransaction() as transaction:
+        for channel, path in channel_paths.items():
+            tex_node = samplers.get(_template_sampler_id(channel))
+            if tex_node is None:
+                continue
+            set_texture_path(tex_node, path)
+            tex_node.SetValue("net.maxon.node.base.name", os.path.basename(path))
+            if channel not in COLOR_CHANNELS:
+                set_colorspace_raw(tex_node)
+        transaction.Commit()
+
+    return mat
@@ -0,0 +1,207 @@
+import c4d # 모듈이여도 c4d는 항상 필요
+import os
+import re
+
+try:
+    from . import texture_utils
+    from . import redshift_utils
+    from . import octane_utils
+except ImportError:
+    import texture_utils
+    import redshift_utils
+    import octane_utils
+
+# --- Bulk Texture Relink ---
+# Rewrites texture paths across the scene, e.g. from a local drive to the farm share.
+# Rules map old paths to new candidates; candidates are checked against one listing of the target roots
+# (ListFiles: names only, no header reads) instead of stat-ing every reference, and paths no rule maps are looked
+# up by file name. All changes are written with one graph transaction per material inside a single undo step.
+
+REGEX_PREFIX = "re:"
+RULE_SEPARATOR = "=>"
+
+class RelinkRule(object):
+    """
+    "old_prefix => new_prefix" or "re:pattern => replacement" (re.sub syntax, first match only).
+    Matching ignores case and slash direction: paths and prefixes are compared with forward slashes.
+    """
+    def __init__(self, text):
+        if RULE_SEPARATOR not in text:
+            raise ValueError(f"Rule needs '{RULE_SEPARATOR}': {text}")
+        old, new = (part.strip() for part in text.split(RULE_SEPARATOR, 1))
+        self.text = text.strip()
+        self.regex = None
+        if old.lower().startswith(REGEX_PREFIX):
+            try:
+                self.regex = re.compile(old[len(REGEX_PREFIX):], re.IGNORECASE)
+            except re.error as e:
+                raise ValueError(f"Invalid pattern in rule {text}: {e}")
+            self.new = new
+        else:
+            if not old:
+                raise ValueError(f"Empty prefix in rule: {text}")
+            self.old = _slashes(old).rstrip("/").lower()
+            self.new = _slashes(new).rstrip("/")
+
+    def Apply(self, path):
+        """Rewritten path, or None if the rule doesn't match."""
+        path = _slashes(path)
+        if self.regex is not None:
+            if not self.regex.search(path):
+                return None
+            return _native(self.regex.sub(self.new, path, count=1))
+        lowered = path.lower()
+        if lowered == self.old or lowered.startswith(self.old + "/"):
+            return _native(self.new + path[len(self.old):])
+        return None
+
+def _slashes(path):
+    return path.replace("\\", "/")
+
+def _native(path):
+    return os.path.normpath(path)
+
+def ParseRelinkRules(text):
+    """Rules from "rule; rule; ..." (or a list of rule strings). Raises ValueError on a malformed rule."""
+    parts = text if isinstance(text, (list, tuple)) else text.split(";")
+    return [RelinkRule(part) for part in parts if part.strip()]
+
+def ApplyRelinkRules(path, rules):
+    """The first rule that matches wins. Returns the rewritten path or None."""
+    for rule in rules:
+        new_path = rule.Apply(path)
+        if new_path is not None:
+            return new_path
+    return None
+
+def ListFiles(roots, progress=None):
+    """
+    Full paths of all image files under the roots (recursive os.scandir walk, names only: no stat, no header
+    reads, nothing written to the texture catalog). progress(dirs_done) is called per listed folder.
+    """
+    files = []
+    stack = list(reversed(roots))
+    done = 0
+    while stack:
+        path = stack.pop()
+        subdirs = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1].lower() in texture_utils.IMAGE_EXTENSIONS:
+                        files.append(entry.path)
+        except OSError as e:
+            print(f"Relink: failed to list {path}: {e}")
+        stack.extend(reversed(subdirs))
+        done += 1
+        if progress:
+            progress(done)
+    return files
+
+class FileListing(object):
+    """Lookup tables over a list of existing files: by normalized full path and by lower-case file name."""
+    def __init__(self, paths):
+        self.by_key = {}
+        self.by_name = {}
+        for path in paths:
+            self.by_key[os.path.normcase(os.path.normpath(path))] = path
+            self.by_name.setdefault(os.path.basename(path).lower(), []).append(path)
+
+    def Find(self, path):
+        """The listed file for path, or None. Tile tokens are checked on disk (one directory listing)."""
+        if texture_utils.HasTileToken(path):
+            return path if texture_utils.TexturePathExists(path) else None
+        return self.by_key.get(os.path.normcase(os.path.normpath(path)))
+
+    def FindByName(self, path):
+        """
+        A listed file with the same name as path. With several candidates, the one sharing the most trailing
+        folders with path wins; a tie is ambiguous and returns None.
+        """
+        if texture_utils.HasTileToken(path):
+            return None
+        candidates = self.by_name.get(os.path.basename(_slashes(path)).lower())
+        if not candidates:
+            return None
+        if len(candidates) == 1:
+            return candidates[0]
+        folders = _slashes(os.path.dirname(_slashes(path))).lower().split("/")
+
+        def shared(candidate):
+            other = _slashes(os.path.dirname(candidate)).lower().split("/")
+            count = 0
+            while count < min(len(folders), len(other)) and folders[-1 - count] == other[-1 - count]:
+                count += 1
+            return count
+        scores = sorted(((shared(c), c) for c in candidates), reverse=True)
+        return scores[0][1] if scores[0][0] > scores[1][0] else None
+
+def PlanRelink(doc, references, rules, listing):
+    """
+    references: {raw path: (abs path or None, users)} (TextureUsageIndex.GetRawReferences).
+    A path a rule matches is moved to the rewritten file if it is listed, else to a listed file of the same name.
+    Paths no rule matches are resolved again (ResolveTexturePath, the cached abs path may be stale) and only looked
+    up by name if they don't resolve now.
+    Returns ({raw path: new path}, [unresolved raw paths]).
+    """
+    plan = {}
+    unresolved = []
+    for raw in references:
+        candidate = ApplyRelinkRules(raw, rules)
+        if candidate is None and texture_utils.ResolveTexturePath(doc, raw):
+            continue # no rule and the file is there: leave it alone
+        found = listing.Find(candidate) if candidate else None
+        if found is None:
+            found = listing.FindByName(candidate or raw)
+        if found is None:
+            unresolved.append(raw)
+        elif found != raw:
+            plan[raw] = found
+    return plan, sorted(unresolved)
+
+def ApplyRelink(doc, plan, references):
+    """
+    Writes the planned paths: one transaction per Redshift material graph, Octane shaders set directly,
+    all inside one undo step. references as for PlanRelink. Returns the number of nodes / shaders changed.
+    """
+    rs_changes = {}     # material -> (graph, [(node, path)])
+    octane_changes = [] # (shader, path)
+    for raw, new_path in plan.items():
+        for user in references[raw][1]:
+            if len(user) == 3: # (material, graph, node) Redshift sampler, (material, shader) Octane
+                mat, graph, node = user
+                rs_changes.setdefault(mat, (graph, []))[1].append((node, new_path))
+            else:
+                octane_changes.append((user[1], new_path))
+    if not rs_changes and not octane_changes:
+        return 0
+
+    doc.StartUndo()
+    for mat, (graph, changes) in rs_changes.items():
+        doc.AddUndo(c4d.UNDOTYPE_CHANGE, mat)
+        with graph.BeginTransaction() as t:
+            for node, new_path in changes:
+                redshift_utils.set_texture_path(node, new_path)
+            t.Commit()
+    for shader, new_path in octane_changes:
+        doc.AddUndo(c4d.UNDOTYPE_CHANGE, shader)
+        shader[octane_utils.IMAGETEXTURE_FILE] = new_path
+    doc.EndUndo()
+    return sum(len(changes) for _, changes in rs_changes.values()) + len(octane_changes)
+
+def FormatRelinkReport(plan, unresolved, references, max_lines=15):
+    """Summary text: relinked files / references and the unresolved paths."""
+    count = sum(len(references[raw][1]) for raw in plan)
+    lines = [f"{len(plan)} file(s) / {count} reference(s) to relink, {len(unresolved)} unresolved."]
+    for raw, new_path in list(plan.items())[:max_lines]:
+        lines.append(f"  {raw}\n    -> {new_path}")
+    if len(plan) > max_lines:
+        lines.append(f"  ... and {len(plan) - max_lines} more")
+    if unresolved:
+        lines.append("Unresolved:")
+        lines.extend(f"  {raw} ({len(references[raw][1])} refs)" for raw in unresolved[:max_lines])
+        if len(unresolved) > max_lines:
+            lines.append(f"  ... and {len(unresolved) - max_lines} more")
+    return "\n".join(lines)
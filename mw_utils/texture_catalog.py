@@ -0,0 +1,324 @@
+import os
+import json
+import sqlite3
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from . import texture_utils
+    from . import image_utils
+except ImportError:
+    import texture_utils
+    import image_utils
+
+# On-disk catalog of texture libraries (SQLite, next to settings.json).
+CATALOG_FILE = os.path.join(os.path.dirname(__file__), "texture_catalog.db")
+SETTINGS_FILE = os.path.join(os.path.dirname(__file__), "settings.json")
+SETTINGS_KEY = "TextureCatalog"
+
+HEADER_WORKERS = 8 # header reads are I/O bound (NAS latency), not CPU bound
+
+# Bumped when the tables change; an older database is dropped and re-indexed (it is only a cache)
+SCHEMA_VERSION = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    guessed_channel TEXT,
+    width INTEGER,
+    height INTEGER,
+    channels INTEGER,
+    bits INTEGER,
+    size INTEGER,
+    mtime REAL,
+    hash TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_dirs_parent ON dirs(parent);
+CREATE INDEX IF NOT EXISTS idx_files_dir ON files(dir);
+"""
+
+def _norm(path):
+    return os.path.normpath(os.path.abspath(path))
+
+def _read_header(path):
+    try:
+        return texture_utils.ReadImageHeader(path)
+    except Exception:
+        return None
+
+class TextureCatalog(object):
+    """
+    Persistent index of texture files: path, resolution, size, mtime, content channel guess and (lazily) hash.
+    Only facts about the files are stored. Set and channel come from the renderer module's
+    classifier(filename) -> (set_name, channel) at query time, so every plugin sees its own naming rules.
+    Directories are only re-listed when their mtime changed, files only re-read when size / mtime changed.
+    (A file overwritten in place does not touch its directory's mtime; GetFileInfo re-checks single files.)
+    """
+    def __init__(self, db_path=CATALOG_FILE):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.conn.executescript("DROP TABLE IF EXISTS files; DROP TABLE IF EXISTS dirs;")
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # --- Updating ---
+
+    def UpdateRoots(self, roots, progress=None):
+        """
+        Incrementally indexes library roots (recursive).
+        Unchanged directories are not listed again; their known subdirectories are still visited.
+        progress(dirs_done) is called after every directory.
+        Returns stats {"dirs_scanned", "dirs_skipped", "files_indexed", "files_removed"}.
+        """
+        stats = {"dirs_scanned": 0, "dirs_skipped": 0, "files_indexed": 0, "files_removed": 0}
+        stack = [(_norm(root), None) for root in roots]
+        done = 0
+        while stack:
+            path, parent = stack.pop()
+            subdirs = self._update_dir(path, parent, stats)
+            stack.extend((d, path) for d in subdirs)
+            done += 1
+            if progress:
+                progress(done)
+        self.conn.commit()
+        return stats
+
+    def _update_dir(self, path, parent, stats):
+        """Refreshes one directory if its mtime changed. Returns its subdirectories."""
+        try:
+            dir_mtime = os.stat(path).st_mtime
+        except OSError:
+            self._remove_tree(path, stats)
+            return []
+
+        row = self.conn.execute("SELECT mtime FROM dirs WHERE path = ?", (path,)).fetchone()
+        if row is not None and row["mtime"] == dir_mtime:
+            stats["dirs_skipped"] += 1
+            return [r["path"] for r in self.conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,))]
+
+        stats["dirs_scanned"] += 1
+        subdirs = []
+        found = {}
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(_norm(entry.path))
+                    elif os.path.splitext(entry.name)[1].lower() in texture_utils.IMAGE_EXTENSIONS:
+                        st = entry.stat()
+                        found[entry.name] = (st.st_size, st.st_mtime)
+        except OSError as e:
+            print(f"Catalog: failed to list {path}: {e}")
+            return []
+
+        known = dict((r["name"], (r["size"], r["mtime"])) for r in
+                     self.conn.execute("SELECT name, size, mtime FROM files WHERE dir = ?", (path,)))
+
+        # Removed files / subdirectories
+        removed = [name for name in known if name not in found]
+        self.conn.executemany("DELETE FROM files WHERE path = ?", [(os.path.join(path, n),) for n in removed])
+        stats["files_removed"] += len(removed)
+        for r in self.conn.execute("SELECT path FROM dirs WHERE parent = ?", (path,)).fetchall():
+            if r["path"] not in subdirs:
+                self._remove_tree(r["path"], stats)
+
+        # New or changed files: read headers (and guess channels from content) in parallel
+        changed = [name for name, sig in found.items() if known.get(name) != sig]
+        if changed:
+            paths = [os.path.join(path, n) for n in changed]
+            with ThreadPoolExecutor(max_workers=HEADER_WORKERS) as pool:
+                rows = list(pool.map(lambda p, n: self._make_row(p, path, n, _read_header(p), found[n]), paths, changed))
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO files (path, dir, name, guessed_channel, width, height, channels, bits, size, mtime, hash) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)", rows)
+            stats["files_indexed"] += len(changed)
+
+        self.conn.execute("INSERT OR REPLACE INTO dirs (path, parent, mtime) VALUES (?, ?, ?)", (path, parent, dir_mtime))
+        return subdirs
+
+    def _make_row(self, file_path, dir_path, name, header, signature):
+        guessed_channel = None
+        if header:
+            # Content guess from a small thumbnail (skipped for files too big to decode cheaply).
+            # It doesn't depend on the file name, so it is valid for every renderer's classifier.
+            guess, confidence = image_utils.ClassifyTextureContent(file_path, header.bits)
+            if confidence >= image_utils.MIN_CONFIDENCE:
+                guessed_channel = guess
+            dims = (header.width, header.height, header.channels, header.bits)
+        else:
+            dims = (None, None, None, None)
+        return (file_path, dir_path, name, guessed_channel) + dims + signature
+
+    def _remove_tree(self, path, stats):
+        prefix = path.rstrip(os.sep) + os.sep
+        like = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        cur = self.conn.execute("DELETE FROM files WHERE dir = ? OR dir LIKE ? ESCAPE '\\'", (path, like))
+        stats["files_removed"] += max(0, cur.rowcount)
+        self.conn.execute("DELETE FROM dirs WHERE path = ? OR path LIKE ? ESCAPE '\\'", (path, like))
+
+    # --- Queries ---
+
+    def ListDirectory(self, path):
+        """
+        Returns the image file names of one directory (non-recursive).
+        Costs a single stat when the directory is unchanged since it was last indexed.
+        """
+        path = _norm(path)
+        row = self.conn.execute("SELECT parent FROM dirs WHERE path = ?", (path,)).fetchone()
+        parent = row["parent"] if row is not None else os.path.dirname(path)
+        self._update_dir(path, parent, {"dirs_scanned": 0, "dirs_skipped": 0, "files_indexed": 0, "files_removed": 0})
+        self.conn.commit()
+        return [r["name"] for r in self.conn.execute("SELECT name FROM files WHERE dir = ? ORDER BY name", (path,))]
+
+    def FindSetFiles(self, path, set_name, classifier):
+        """Returns full paths of all files in path's directory whose set name (by classifier) matches."""
+        dir_path = _norm(path if os.path.isdir(path) else os.path.dirname(path))
+        return [os.path.join(dir_path, name) for name in self.ListDirectory(dir_path) if classifier(name)[0] == set_name]
+
+    def GetFileInfo(self, path):
+        """
+        Returns the catalog row of a file (width, height, channels, bits, size, mtime, ...), or None if missing.
+        Re-reads the header only when size / mtime differ from the catalog.
+        """
+        path = _norm(path)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+
+        row = self.conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+        if row is not None and row["size"] == st.st_size and row["mtime"] == st.st_mtime:
+            return row
+
+        dir_path, name = os.path.split(path)
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, dir, name, guessed_channel, width, height, channels, bits, size, mtime, hash) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, NULL)",
+            self._make_row(path, dir_path, name, _read_header(path), (st.st_size, st.st_mtime)))
+        self.conn.commit()
+        return self.conn.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+
+    def GetFileHash(self, path):
+        """Content hash (sha1) of a file, computed once and kept until the file changes."""
+        row = self.GetFileInfo(path)
+        if row is None:
+            return None
+        if row["hash"]:
+            return row["hash"]
+
+        h = hashlib.sha1()
+        with open(row["path"], "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        self.conn.execute("UPDATE files SET hash = ? WHERE path = ?", (digest, row["path"]))
+        self.conn.commit()
+        return digest
+
+# --- Settings / Shared Instance ---
+
+def GetLibraryRoots():
+    """Library root folders from settings.json ("TextureCatalog" > "roots")."""
+    try:
+        with open(SETTINGS_FILE, 'r') as f:
+            return list(json.load(f).get(SETTINGS_KEY, {}).get("roots", []))
+    except Exception:
+        return []
+
+def AddLibraryRoot(path):
+    """Adds a library root folder to settings.json."""
+    try:
+        all_settings = {}
+        if os.path.exists(SETTINGS_FILE):
+            with open(SETTINGS_FILE, 'r') as f:
+                all_settings = json.load(f)
+        section = all_settings.setdefault(SETTINGS_KEY, {})
+        roots = section.setdefault("roots", [])
+        if path not in roots:
+            roots.append(path)
+        with open(SETTINGS_FILE, 'w') as f:
+            json.dump(all_settings, f, indent=4)
+    except Exception as e:
+        print(f"Error saving settings: {e}")
+
+_CATALOG = None
+
+def GetCatalog():
+    """
+    Returns the shared catalog (opened on first use), or None if the database can't be opened.
+    Callers fall back to scanning the file system in that case.
+    """
+    global _CATALOG
+    if _CATALOG is None:
+        try:
+            _CATALOG = TextureCatalog()
+        except sqlite3.Error as e:
+            print(f"Texture catalog unavailable: {e}")
+            return None
+    return _CATALOG
+
+def ListImageFiles(directory):
+    """Image file names in directory, from the catalog if available, else from the file system."""
+    catalog = GetCatalog()
+    if catalog:
+        return catalog.ListDirectory(directory)
+    return sorted(f for f in os.listdir(directory)
+                  if os.path.splitext(f)[1].lower() in texture_utils.IMAGE_EXTENSIONS
+                  and os.path.isfile(os.path.join(directory, f)))
+
+def GetTextureInfo(files):
+    """
+    Returns (total size in bytes, (width, height) of the first file or None) for the files of one texture.
+    Uses the catalog if available, so unchanged files cost a stat instead of an image open.
+    """
+    catalog = GetCatalog()
+    size_bytes = 0
+    resolution = None
+    for index, path in enumerate(files):
+        if catalog:
+            row = catalog.GetFileInfo(path)
+            if row is None:
+                continue
+            size_bytes += row["size"]
+            if index == 0 and row["width"]:
+                resolution = (row["width"], row["height"])
+        else:
+            size_bytes += os.path.getsize(path)
+            if index == 0:
+                header = _read_header(path)
+                resolution = (header.width, header.height) if header else None
+    return size_bytes, resolution
+
+def GetDecodedBytes(files):
+    """Decoded (in memory) size of the files of one texture, from cached headers. Unreadable files count 0."""
+    catalog = GetCatalog()
+    total = 0
+    for path in files:
+        if catalog:
+            row = catalog.GetFileInfo(path)
+            if row is not None and row["width"]:
+                total += texture_utils.DecodedBytes(row["width"], row["height"], row["channels"], row["bits"])
+        else:
+            header = _read_header(path)
+            if header:
+                total += header.decoded_bytes
+    return total
+
+def GetTextureChannel(path, classifier):
+    """
+    PBR channel of a file from its name token (classifier), never from the content guess:
+    callers pick resize filters from this.
+    """
+    return classifier(os.path.basename(path))[1]
@@ -0,0 +1,216 @@
+import c4d # 모듈이여도 c4d는 항상 필요
+import os
+
+try:
+    from . import texture_utils
+    from . import redshift_utils
+    from . import octane_utils
+    from . import mw_utils
+except ImportError:
+    import texture_utils
+    import redshift_utils
+    import octane_utils
+    import mw_utils
+    if not hasattr(mw_utils, "IterAllObjects"): # the mw_utils package was imported first (Octane plugins)
+        from mw_utils import mw_utils
+
+# --- Scene Texture Usage Index ---
+# Answers "who uses this file?" for the whole document: resolved file -> Texture Sampler nodes / Octane Image
+# Texture shaders, their materials and the objects those materials are assigned to.
+# Materials are re-read only when their dirty counters change, so repeated queries (resize dialog, memory report,
+# duplicate consolidation, relinking) share one scan instead of walking every graph. A path is resolved again only
+# when the mtime of a directory it resolves in changed (a file was added, removed or renamed there), which costs one
+# stat per directory instead of one per referenced file. Files overwritten in place keep their resolution.
+
+REDSHIFT = "redshift" # users are (material, graph, sampler node)
+OCTANE = "octane"     # users are (material, shader)
+
+def PathKey(abs_path):
+    """Case / separator normalized key of an absolute path (the keys used by the index and the dialogs)."""
+    return os.path.normcase(os.path.abspath(abs_path))
+
+def GetMaterialReferences(mat):
+    """[(kind, raw path, user), ...] of every Texture Sampler / Image Texture of one material."""
+    refs = []
+    graph, nodes = redshift_utils.get_material_texture_samplers(mat)
+    refs.extend((REDSHIFT, redshift_utils.get_texture_path(node), (mat, graph, node)) for node in nodes)
+    refs.extend((OCTANE, str(shader[octane_utils.IMAGETEXTURE_FILE] or ""), (mat, shader))
+                for shader in octane_utils.GetImageTextureShaders(mat))
+    return refs
+
+def _material_signature(mat):
+    # Node graph edits mark the material's data dirty; Octane shader edits only mark the shader.
+    return (mat.GetDirty(c4d.DIRTYFLAGS_DATA),
+            tuple(shader.GetDirty(c4d.DIRTYFLAGS_DATA) for shader in octane_utils.GetAllShaders(mat)))
+
+def _resolution_dirs(doc_path, raw):
+    """Directories whose listing decides how raw resolves (the candidates of texture_utils.ResolveTexturePath)."""
+    if os.path.isabs(raw):
+        return [os.path.dirname(raw)]
+    if not doc_path:
+        return []
+    sub = os.path.dirname(raw)
+    return [os.path.join(doc_path, sub), os.path.join(doc_path, "tex", sub)]
+
+def _dir_mtime(path, cache):
+    """mtime of a directory (None if it doesn't exist), stat once per update through cache."""
+    if path not in cache:
+        try:
+            cache[path] = os.stat(path).st_mtime
+        except OSError:
+            cache[path] = None
+    return cache[path]
+
+class TextureUsageIndex(object):
+    """
+    Texture usage of one document, updated incrementally by Update(doc).
+    Each material keeps [(kind, raw path, key or None, abs path, user)] until its signature changes;
+    the per-file view is rebuilt from those lists whenever any material or any path's resolution changed.
+    A raw path is resolved again when one of its candidate directories changed mtime; if it now resolves
+    differently, the rows using it are patched without re-reading the material.
+    Material -> objects comes from texture tags and is rebuilt when objects, hierarchy or tags change.
+    """
+    def __init__(self):
+        self.doc_path = None
+        self.paths = {}              # raw path -> (abs path or None, ((candidate dir, mtime), ...))
+        self.materials = {}          # material -> (signature, [(kind, raw, key, abs_path, user)])
+        self.files = {}              # key -> (abs_path, [(kind, user)])
+        self.missing = {}            # raw path -> [(kind, user)] (unresolved)
+        self.objects_dirty = None
+        self.material_objects = {}   # material -> [objects with a texture tag of it]
+
+    def _Resolve(self, doc, raw, dir_mtimes):
+        dirs = tuple((d, _dir_mtime(d, dir_mtimes)) for d in _resolution_dirs(self.doc_path, raw))
+        abs_path = texture_utils.ResolveTexturePath(doc, raw)
+        self.paths[raw] = (abs_path, dirs)
+        return abs_path
+
+    def _Row(self, kind, raw, user):
+        abs_path = self.paths[raw][0]
+        return (kind, raw, PathKey(abs_path) if abs_path else None, abs_path, user)
+
+    def Update(self, doc):
+        """Re-reads changed materials, re-resolves paths in changed directories and, if needed, the texture tag assignments. Returns self."""
+        doc_path = doc.GetDocumentPath()
+        if doc_path != self.doc_path: # relative paths resolve against the document folder
+            self.doc_path = doc_path
+            self.paths = {}
+            self.materials = {}
+
+        dir_mtimes = {}
+        stale = set() # raw paths that resolve differently since the last update
+        for raw, (abs_path, dirs) in list(self.paths.items()):
+            if any(_dir_mtime(d, dir_mtimes) != mtime for d, mtime in dirs):
+                if self._Resolve(doc, raw, dir_mtimes) != abs_path:
+                    stale.add(raw)
+
+        changed = bool(stale)
+        materials = {}
+        for mat in doc.GetMaterials():
+            signature = _material_signature(mat)
+            entry = self.materials.get(mat)
+            if entry is None or entry[0] != signature:
+                rows = []
+                for kind, raw, user in GetMaterialReferences(mat):
+                    if raw not in self.paths:
+                        self._Resolve(doc, raw, dir_mtimes)
+                    rows.append(self._Row(kind, raw, user))
+                entry = (signature, rows)
+                changed = True
+            elif stale and any(row[1] in stale for row in entry[1]):
+                entry = (signature, [self._Row(row[0], row[1], row[4]) if row[1] in stale else row for row in entry[1]])
+            materials[mat] = entry
+        if changed or len(materials) != len(self.materials):
+            self.materials = materials
+            used = set(row[1] for _, rows in materials.values() for row in rows)
+            self.paths = {raw: state for raw, state in self.paths.items() if raw in used}
+            self._RebuildFiles()
+
+        objects_dirty = doc.GetHDirty(c4d.HDIRTYFLAGS_OBJECT | c4d.HDIRTYFLAGS_OBJECT_HIERARCHY | c4d.HDIRTYFLAGS_TAG)
+        if objects_dirty != self.objects_dirty:
+            self.objects_dirty = objects_dirty
+            self.material_objects = {}
+            for obj in mw_utils.IterAllObjects(doc):
+                for tag in obj.GetTags():
+                    if tag.CheckType(c4d.Ttexture) and tag.GetMaterial() is not None:
+                        users = self.material_objects.setdefault(tag.GetMaterial(), [])
+                        if not users or users[-1] != obj:
+                            users.append(obj)
+        return self
+
+    def _RebuildFiles(self):
+        self.files = {}
+        self.missing = {}
+        for _, rows in self.materials.values():
+            for kind, raw, key, abs_path, user in rows:
+                if key is None:
+                    if raw:
+                        self.missing.setdefault(raw, []).append((kind, user))
+                else:
+                    self.files.setdefault(key, (abs_path, []))[1].append((kind, user))
+
+    def GetFiles(self):
+        """{key: abs path} of every resolved file in the scene."""
+        return {key: abs_path for key, (abs_path, _) in self.files.items()}
+
+    def GetUsers(self, key, kind=None):
+        """Sampler / shader users of one file: [(material, graph, node)] or [(material, shader)]."""
+        entry = self.files.get(key)
+        if entry is None:
+            return []
+        return [user for user_kind, user in entry[1] if kind is None or user_kind == kind]
+
+    def GetMaterials(self, key):
+        """Materials using a file, in material order without duplicates."""
+        return list(dict.fromkeys(user[0] for user in self.GetUsers(key)))
+
+    def GetObjects(self, key):
+        """Objects that have a texture tag of a material using the file."""
+        objects = []
+        for mat in self.GetMaterials(key):
+            objects.extend(self.material_objects.get(mat, []))
+        return list(dict.fromkeys(objects))
+
+    def GetReferences(self, kind=None):
+        """{key: (abs path, [users])} for one render engine (the shape the resize dialogs work with)."""
+        refs = {}
+        for key, (abs_path, users) in self.files.items():
+            selected = [user for user_kind, user in users if kind is None or user_kind == kind]
+            if selected:
+                refs[key] = (abs_path, selected)
+        return refs
+
+    def GetMissing(self, kind=None):
+        """{raw path: [users]} of paths that don't resolve to an existing file."""
+        missing = {}
+        for raw, users in self.missing.items():
+            selected = [user for user_kind, user in users if kind is None or user_kind == kind]
+            if selected:
+                missing[raw] = selected
+        return missing
+
+    def GetRawReferences(self, kind=None):
+        """{raw path: (abs path or None, [users])} of every non-empty path as written in the scene (for relinking)."""
+        refs = {}
+        for _, rows in self.materials.values():
+            for row_kind, raw, _, abs_path, user in rows:
+                if raw and (kind is None or row_kind == kind):
+                    refs.setdefault(raw, (abs_path, []))[1].append(user)
+        return refs
+
+    def GetMaterialFiles(self, kind=None):
+        """{material: set of keys} of every material with at least one texture of that kind."""
+        result = {}
+        for mat, (_, rows) in self.materials.items():
+            for row_kind, _, key, _, _ in rows:
+                if kind is None or row_kind == kind:
+                    keys = result.setdefault(mat, set())
+                    if key is not None:
+                        keys.add(key)
+        return result
+
+_USAGE_INDEXES = mw_utils.DocumentCache(TextureUsageIndex) # dropped with their document
+
+def GetTextureUsageIndex(doc):
+    """The document's TextureUsageIndex, brought up to date."""
+    return _USAGE_INDEXES.Get(doc).Update(doc)
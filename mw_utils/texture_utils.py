@@ -0,0 +1,728 @@
+import os
+import re
+import math
+import heapq
+import struct
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# PIL is optional here: PNG / JPEG / EXR / HDR headers are parsed directly, PIL is only used for other formats.
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# --- Texture file helpers shared by the Redshift and Octane plugins (no c4d dependency) ---
+
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".tif", ".tiff", ".exr", ".hdr", ".psd", ".tga"}
+
+# Suffix appended to resized variants (Wood_Color.png -> Wood_Color_Low.png)
+VARIANT_SUFFIX = "_Low"
+
+# --- UDIM / UV Tiles ---
+TILE_UDIM = "udim"         # Mari style: Wood_BaseColor.1001.exr
+TILE_UVTILE = "uvtile"     # Mudbox style: Wood_BaseColor_u1_v1.exr
+
+# Tile number at the end of the stem, or followed by another separator
+_UDIM_PATTERN = re.compile(r"(?<=[._])(1\d{3})(?=[._]|$)")
+_UVTILE_PATTERN = re.compile(r"(?<=[._])(u\d+_v\d+)(?=[._]|$)", re.IGNORECASE)
+_TOKEN_PATTERN = re.compile(r"<(UDIM|UVTILE)>", re.IGNORECASE)
+
+def GetTileInfo(filename):
+    """
+    Detects a UDIM (1001) or UV tile (u1_v1) number in a filename.
+    Returns (kind, tile, prefix, suffix) so that filename == prefix + tile + suffix, or None.
+    """
+    stem, ext = os.path.splitext(filename)
+    for kind, pattern in ((TILE_UVTILE, _UVTILE_PATTERN), (TILE_UDIM, _UDIM_PATTERN)):
+        matches = list(pattern.finditer(stem))
+        if matches:
+            m = matches[-1] # The tile number is usually the last number in the name
+            return kind, m.group(1), stem[:m.start()], stem[m.end():] + ext
+    return None
+
+def HasTileToken(path):
+    """Returns True if the path contains a <UDIM> / <UVTILE> token."""
+    return bool(path) and _TOKEN_PATTERN.search(os.path.basename(path)) is not None
+
+def CollapseTileSets(paths, udim_token="<UDIM>", uvtile_token="<UVTILE>"):
+    """
+    Replaces every UDIM / UV tile set in paths by a single path containing the renderer's tile token.
+    Order is preserved (the set takes the position of its first tile).
+    A single tile is only collapsed if it is the first tile (1001 / u1_v1), so names like
+    'Brick_1024.png' are left alone.
+    """
+    groups = {}
+    for path in paths:
+        info = GetTileInfo(os.path.basename(path))
+        if info:
+            kind, tile, prefix, suffix = info
+            key = (os.path.dirname(path), kind, prefix, suffix)
+            groups.setdefault(key, []).append(tile)
+
+    result = []
+    emitted = set()
+    for path in paths:
+        info = GetTileInfo(os.path.basename(path))
+        if not info:
+            result.append(path)
+            continue
+
+        kind, tile, prefix, suffix = info
+        key = (os.path.dirname(path), kind, prefix, suffix)
+        tiles = groups[key]
+        if len(tiles) < 2 and tile.lower() not in ("1001", "u1_v1"):
+            result.append(path)
+            continue
+
+        if key in emitted:
+            continue
+        emitted.add(key)
+        token = udim_token if kind == TILE_UDIM else uvtile_token
+        result.append(os.path.join(key[0], prefix + token + suffix))
+    return result
+
+def _token_to_regex(filename, capture=False):
+    """Builds a regex matching the concrete files of a tokenized filename."""
+    parts = _TOKEN_PATTERN.split(filename)
+    # split() with one group returns [text, token, text, token, ...]
+    regex = ""
+    for i, part in enumerate(parts):
+        if i % 2 == 0:
+            regex += re.escape(part)
+            continue
+        tile_regex = r"1\d{3}" if part.upper() == "UDIM" else r"u\d+_v\d+"
+        regex += f"({tile_regex})" if capture else tile_regex
+    return regex
+
+def ExpandTilePath(path):
+    """
+    Returns the sorted list of existing files matching a tokenized path.
+    Paths without a token are returned as [path] if they exist.
+    """
+    if not HasTileToken(path):
+        return [path] if os.path.isfile(path) else []
+
+    dirname, filename = os.path.split(path)
+    pattern = re.compile("^" + _token_to_regex(filename) + "$", re.IGNORECASE)
+    try:
+        names = os.listdir(dirname or ".")
+    except OSError:
+        return []
+    return sorted(os.path.join(dirname, f) for f in names if pattern.match(f))
+
+def GetTextureFiles(path):
+    """Returns the concrete files behind a texture path (all tiles / all frames of a sequence)."""
+    return ExpandSequence(path) or ExpandTilePath(path)
+
+def TexturePathExists(path):
+    """os.path.exists that understands tile tokens."""
+    if HasTileToken(path):
+        return len(ExpandTilePath(path)) > 0
+    return os.path.exists(path)
+
+def ResolveTexturePath(doc, path_str):
+    """Resolves a texture path to an absolute path."""
+    if not path_str or not doc:
+        return None
+
+    # Already absolute?
+    if os.path.isabs(path_str):
+        return path_str if TexturePathExists(path_str) else None
+
+    # Resolve relative
+    doc_path = doc.GetDocumentPath()
+    if not doc_path:
+        return None
+
+    cand1 = os.path.join(doc_path, path_str)
+    if TexturePathExists(cand1):
+        return cand1
+
+    cand2 = os.path.join(doc_path, "tex", path_str)
+    if TexturePathExists(cand2):
+        return cand2
+
+    return None
+
+def MakeReferencePath(doc, original, abs_path):
+    """
+    Path to write into a texture reference that used to hold original: relative to the document folder
+    (same './' prefix and slash style) when original was relative, so the project stays movable.
+    Absolute references and files outside the document folder get abs_path.
+    """
+    doc_path = doc.GetDocumentPath() if doc else ""
+    if not original or os.path.isabs(original) or not doc_path:
+        return abs_path
+    try:
+        rel = os.path.relpath(abs_path, doc_path)
+    except ValueError: # different drive (Windows)
+        return abs_path
+    if rel == os.pardir or rel.startswith(os.pardir + os.sep):
+        return abs_path
+    if "\\" not in original:
+        rel = rel.replace("\\", "/")
+    if original.startswith(("./", ".\\")):
+        rel = original[:2] + rel
+    return rel
+
+def ExpandTileJobs(src_path, dst_path):
+    """
+    Pairs every existing tile of src_path with the matching file name of dst_path.
+    Both paths must use the same token. Returns [(src_tile, dst_tile), ...].
+    Paths without a token return [(src_path, dst_path)].
+    """
+    if not HasTileToken(src_path):
+        return [(src_path, dst_path)]
+
+    src_name = os.path.basename(src_path)
+    regex = re.compile("^" + _token_to_regex(src_name, capture=True) + "$", re.IGNORECASE)
+    jobs = []
+    for tile_path in ExpandTilePath(src_path):
+        m = regex.match(os.path.basename(tile_path))
+        if not m:
+            continue
+        tiles = iter(m.groups())
+        jobs.append((tile_path, _TOKEN_PATTERN.sub(lambda _: next(tiles), dst_path)))
+    return jobs
+
+# --- Image Sequences ---
+
+# Frame token at the end of the stem: dot separated, zero padded to 3+ digits (fx_emit.0001.png).
+# Names like Rock_01.png / Wood_2.png are numbered variants, not frames.
+_SEQUENCE_PATTERN = re.compile(r"^(.*\.)(\d{3,})(\.[^.]+)$")
+MIN_SEQUENCE_FRAMES = 3 # contiguous frames on disk before files are treated as one sequence
+
+def GetSequenceInfo(filename):
+    """Returns (prefix, frame, ext) for names ending in a frame token, else None."""
+    m = _SEQUENCE_PATTERN.match(filename)
+    return m.groups() if m else None
+
+def ExpandSequence(path):
+    """
+    Returns all frames (sorted by frame number) of the image sequence path belongs to: files with the
+    same prefix and the same frame padding. Returns [] unless at least MIN_SEQUENCE_FRAMES of them are
+    contiguous numbers, so two numbered files that only look alike are never resized together.
+    """
+    if not path or HasTileToken(path):
+        return []
+    dirname, filename = os.path.split(path)
+    info = GetSequenceInfo(filename)
+    if not info:
+        return []
+
+    prefix, frame, ext = info
+    pattern = re.compile("^" + re.escape(prefix) + r"(\d{%d})" % len(frame) + re.escape(ext) + "$", re.IGNORECASE)
+    try:
+        names = os.listdir(dirname or ".")
+    except OSError:
+        return []
+
+    frames = []
+    for f in names:
+        m = pattern.match(f)
+        if m:
+            frames.append((int(m.group(1)), os.path.join(dirname, f)))
+    frames.sort()
+
+    run = longest = 1
+    for (previous, _), (current, _) in zip(frames, frames[1:]):
+        run = run + 1 if current == previous + 1 else 1
+        longest = max(longest, run)
+    if len(frames) < MIN_SEQUENCE_FRAMES or longest < MIN_SEQUENCE_FRAMES:
+        return []
+    return [f for _, f in frames]
+
+# --- Variant (_Low) Naming ---
+
+def _split_variant_name(filename, sequence=False):
+    """
+    Splits a filename into (stem, tail, ext). The tail is the tile token ('.<UDIM>', '_<UVTILE>')
+    or, for sequences, the frame number ('.0001'). It has to stay at the end of the name,
+    so variant suffixes are inserted before it.
+    """
+    name, ext = os.path.splitext(filename)
+    m = re.search(r"[._]<(UDIM|UVTILE)>$", name, re.IGNORECASE)
+    if not m and sequence:
+        m = re.search(r"\.\d{3,}$", name)
+    if m:
+        return name[:m.start()], name[m.start():], ext
+    return name, "", ext
+
+def GetRootTextureName(filename):
+    """Strips sequence of '_Low' suffixes to find the root name. Returns (name, ext)."""
+    name, tail, ext = _split_variant_name(filename)
+    if not name.endswith(VARIANT_SUFFIX):
+        # Sequence variants keep the frame number last: fx_emit_Low.0001.png
+        seq_name, seq_tail, _ = _split_variant_name(filename, sequence=True)
+        if seq_tail and seq_name.endswith(VARIANT_SUFFIX):
+            name, tail = seq_name, seq_tail
+    while name.endswith(VARIANT_SUFFIX):
+        name = name[:-len(VARIANT_SUFFIX)]
+    return name + tail, ext
+
+def GetVariantLevel(filename):
+    """Number of '_Low' halvings in a file name (Wood_Color_Low_Low.png -> 2)."""
+    root, _ = GetRootTextureName(filename)
+    return (len(os.path.splitext(filename)[0]) - len(root)) // len(VARIANT_SUFFIX)
+
+def MakeVariantName(filename, suffix=VARIANT_SUFFIX, sequence=False):
+    """Wood_Color.png -> Wood_Color_Low.png, Wood_Color.<UDIM>.exr -> Wood_Color_Low.<UDIM>.exr"""
+    name, tail, ext = _split_variant_name(filename, sequence)
+    return name + suffix + tail + ext
+
+def GetVariantPattern(filename, sequence=False):
+    """Compiled regex matching the files of every resized variant (one or more '_Low') of filename."""
+    root, ext = GetRootTextureName(filename)
+    name, tail, _ = _split_variant_name(root + ext, sequence)
+    tail_regex = r"\.\d{%d}" % (len(tail) - 1) if sequence and tail else _token_to_regex(tail)
+    return re.compile(f"^{re.escape(name)}({re.escape(VARIANT_SUFFIX)})+{tail_regex}{re.escape(ext)}$", re.IGNORECASE)
+
+def IsVariantCurrent(src_path, dst_path):
+    """True if dst_path exists and is not older than src_path."""
+    try:
+        return os.path.getmtime(dst_path) >= os.path.getmtime(src_path)
+    except OSError:
+        return False
+
+def GetResizeJobs(abs_path, target_folder, suffix=VARIANT_SUFFIX):
+    """
+    Plans the resize of one logical texture into target_folder.
+    UDIM / UV tile sets and image sequences expand to one job per file, with consistent names.
+    Returns (target_path, [(src_file, dst_file), ...]); target_path is what the sampler should point at.
+    """
+    filename = os.path.basename(abs_path)
+    frames = ExpandSequence(abs_path)
+    if frames:
+        target_path = os.path.join(target_folder, MakeVariantName(filename, suffix, sequence=True))
+        jobs = [(f, os.path.join(target_folder, MakeVariantName(os.path.basename(f), suffix, sequence=True))) for f in frames]
+        return target_path, jobs
+
+    target_path = os.path.join(target_folder, MakeVariantName(filename, suffix))
+    return target_path, ExpandTileJobs(abs_path, target_path)
+
+# --- Downscale Policy ---
+
+# Per channel rule (settings.json "ResizeTexture" > "channel_policy"), keys are GetTextureChannel results:
+#   "scale"    fraction of the original resolution, snapped to a power of two (variants are halvings)
+#   "max_size" longest side in px, adds halvings until it fits
+#   "min_size" shortest side "scale" never goes below (default MIN_POLICY_SIZE)
+# "default" applies to unclassified maps.
+DEFAULT_CHANNEL_POLICY = {
+    "base_color":     {"max_size": 4096},
+    "normal":         {"max_size": 4096},
+    "emission_color": {"scale": 0.5},
+    "translucency":   {"scale": 0.5},
+    "opacity_color":  {"scale": 0.5},
+    "bump":           {"scale": 0.5},
+    "displacement":   {"max_size": 4096},
+    "refl_roughness": {"scale": 0.25},
+    "glossiness":     {"scale": 0.25},
+    "refl_weight":    {"scale": 0.25},
+    "ao":             {"scale": 0.25},
+    "metalness":      {"scale": 0.25},
+    "default":        {"scale": 1.0},
+}
+MIN_POLICY_SIZE = 256
+
+def GetPolicyRule(policy, channel):
+    """Rule of a channel, falling back to the policy's "default" entry."""
+    return policy.get(channel) or policy.get("default") or {}
+
+def GetPolicyLevel(width, height, rule):
+    """Number of halvings an original of width x height gets under a policy rule."""
+    levels = 0
+    scale = rule.get("scale", 1.0)
+    if 0 < scale < 1:
+        levels = int(round(math.log2(1.0 / scale)))
+    min_size = rule.get("min_size", MIN_POLICY_SIZE)
+    while levels > 0 and min(width, height) >> levels < min_size:
+        levels -= 1
+    max_size = rule.get("max_size")
+    if max_size:
+        while max(width, height) >> levels > max_size:
+            levels += 1
+    return levels
+
+# --- Memory Budget ---
+
+# Visual cost of halving a map, per channel (lower = downscaled first)
+CHANNEL_IMPORTANCE = {
+    "base_color": 1.0, "normal": 1.0, "displacement": 0.8, "emission_color": 0.6, "opacity_color": 0.6,
+    "bump": 0.5, "translucency": 0.5, "refl_roughness": 0.3, "glossiness": 0.3, "refl_weight": 0.3,
+    "ao": 0.25, "metalness": 0.25, "default": 0.5,
+}
+
+def SolveTextureBudget(textures, budget_bytes, importance=CHANNEL_IMPORTANCE, min_size=MIN_POLICY_SIZE):
+    """
+    Chooses halvings so the decoded total of textures fits budget_bytes.
+    textures: [(key, decoded bytes, (width, height), channel, usage count)], one entry per unique file.
+    Greedy: the halving with the most bytes saved per unit of cost (channel importance x usage count) goes first,
+    then steps that turned out unnecessary are dropped again, newest first.
+    Returns ({key: halvings}, decoded total after). The total stays above budget when every map hits min_size.
+    """
+    total = sum(t[1] for t in textures)
+    heap = []
+
+    def push(index, size, width, height, cost):
+        if min(width, height) // 2 >= min_size:
+            heapq.heappush(heap, (-(size - size // 4) / cost, index, size, width, height, cost))
+
+    for index, (key, size, (width, height), channel, usage) in enumerate(textures):
+        cost = importance.get(channel, importance.get("default", 0.5)) * max(1, usage)
+        push(index, size, width, height, cost)
+
+    steps = {}
+    taken = []
+    while total > budget_bytes and heap:
+        _, index, size, width, height, cost = heapq.heappop(heap)
+        key = textures[index][0]
+        saved = size - size // 4
+        total -= saved
+        steps[key] = steps.get(key, 0) + 1
+        taken.append((key, steps[key], saved))
+        push(index, size // 4, width // 2, height // 2, cost)
+
+    # Greedy overshoot: undo the last step of a texture while the total still fits
+    for key, step, saved in reversed(taken):
+        if steps[key] == step and total + saved <= budget_bytes:
+            total += saved
+            steps[key] -= 1
+    return {key: count for key, count in steps.items() if count}, total
+
+# --- Channel Packing ---
+
+PACKED_EXTENSION = ".png"
+
+def MakePackedTexturePath(source_paths, set_name, label="ORM"):
+    """Path of a channel-packed texture (e.g. Wood_ORM.png) next to the first existing source map."""
+    folder = os.path.dirname(next(p for p in source_paths if p))
+    return os.path.join(folder, f"{set_name}_{label}{PACKED_EXTENSION}")
+
+def IsPackedTextureCurrent(packed_path, source_paths):
+    """True if packed_path exists and is not older than any of its source maps."""
+    return all(IsVariantCurrent(src, packed_path) for src in source_paths if src)
+
+# --- Image Headers ---
+
+def DecodedBytes(width, height, channels, bits):
+    """Memory of the decoded pixels (what a renderer uploads), not the compressed file size."""
+    return width * height * channels * max(1, bits // 8)
+
+MIP_OVERHEAD = 4.0 / 3.0 # full mip chain: 1 + 1/4 + 1/16 + ...
+
+def EstimateVRAM(decoded_bytes, mipmaps=True):
+    """GPU memory estimate of a decoded texture, including its mip chain."""
+    return int(decoded_bytes * MIP_OVERHEAD) if mipmaps else decoded_bytes
+
+def FormatMemoryReport(materials, vram, max_lines=15):
+    """
+    Texture memory report, biggest first.
+    materials: [(material name, set of file keys)], vram: {file key: estimated bytes}.
+    Files shared by several materials count once in the scene total, but in every material's line.
+    """
+    mb = 1024.0 * 1024.0
+    used = set().union(*[keys for _, keys in materials]) if materials else set()
+    total = sum(vram.get(key, 0) for key in used)
+    lines = [f"Scene: {total / mb:.1f} MB estimated VRAM in {len(used)} texture file(s) (incl. mipmaps)", "", "Materials:"]
+
+    rows = sorted(((sum(vram.get(key, 0) for key in keys), name, len(keys)) for name, keys in materials), reverse=True)
+    for size, name, count in rows[:max_lines]:
+        lines.append(f"  {size / mb:8.1f} MB  {name} ({count} file(s))")
+    if len(rows) > max_lines:
+        lines.append(f"  ... and {len(rows) - max_lines} more")
+
+    lines += ["", "Textures:"]
+    files = sorted(((vram.get(key, 0), key) for key in used), reverse=True)
+    for size, key in files[:max_lines]:
+        lines.append(f"  {size / mb:8.1f} MB  {os.path.basename(key)}")
+    if len(files) > max_lines:
+        lines.append(f"  ... and {len(files) - max_lines} more")
+    return "\n".join(lines)
+
+class ImageHeader(object):
+    """Image properties read from the file header only (no pixel decode)."""
+    def __init__(self, path, width, height, channels, bits, format_name):
+        self.path = path
+        self.width = width
+        self.height = height
+        self.channels = channels
+        self.bits = bits # bits per channel
+        self.format = format_name
+
+    @property
+    def resolution_str(self):
+        return f"{self.width}x{self.height}"
+
+    @property
+    def decoded_bytes(self):
+        """Size of the decoded pixels: width x height x channels x bytes per channel."""
+        return DecodedBytes(self.width, self.height, self.channels, self.bits)
+
+    def __repr__(self):
+        return f"ImageHeader({os.path.basename(self.path)}, {self.resolution_str}, {self.channels}ch, {self.bits}bit)"
+
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 3, 4: 2, 6: 4}
+_EXR_PIXEL_BITS = {0: 32, 1: 16, 2: 32} # UINT, HALF, FLOAT
+
+def _read_png_header(f, path):
+    data = f.read(33)
+    if len(data) < 33 or data[12:16] != b"IHDR":
+        raise ValueError("Invalid PNG header")
+    width, height, bits, color_type = struct.unpack(">IIBB", data[16:26])
+    return ImageHeader(path, width, height, _PNG_CHANNELS.get(color_type, 3), max(8, bits), "PNG")
+
+def _read_jpeg_header(f, path):
+    f.read(2) # SOI
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            raise ValueError("JPEG SOF marker not found")
+        code = marker[1]
+        if code == 0xFF: # padding
+            f.seek(-1, 1)
+            continue
+        length_data = f.read(2)
+        if len(length_data) < 2:
+            raise ValueError("Truncated JPEG header")
+        length = struct.unpack(">H", length_data)[0]
+        # SOF0..SOF15 except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            bits, height, width, components = struct.unpack(">BHHB", f.read(6))
+            return ImageHeader(path, width, height, components, bits, "JPEG")
+        f.seek(length - 2, 1)
+
+def _read_exr_header(f, path):
+    f.read(8) # magic + version
+    width = height = None
+    channels = 0
+    bits = 16
+    while True:
+        name = _read_cstring(f)
+        if not name:
+            break
+        attr_type = _read_cstring(f)
+        size = struct.unpack("<i", f.read(4))[0]
+        value = f.read(size)
+        if len(value) < size:
+            raise ValueError("Truncated EXR header")
+        if name == "dataWindow" and attr_type == "box2i":
+            xmin, ymin, xmax, ymax = struct.unpack("<iiii", value[:16])
+            width, height = xmax - xmin + 1, ymax - ymin + 1
+        elif name == "channels" and attr_type == "chlist":
+            pos = 0
+            channel_bits = []
+            while pos < len(value) and value[pos] != 0:
+                pos = value.index(b"\0", pos) + 1
+                pixel_type = struct.unpack("<i", value[pos:pos + 4])[0]
+                channel_bits.append(_EXR_PIXEL_BITS.get(pixel_type, 32))
+                pos += 16 # pixel type, pLinear + reserved, x/y sampling
+            channels = len(channel_bits)
+            bits = max(channel_bits) if channel_bits else bits
+    if width is None:
+        raise ValueError("EXR dataWindow not found")
+    return ImageHeader(path, width, height, channels or 3, bits, "EXR")
+
+def _read_hdr_header(f, path):
+    f.readline() # #?RADIANCE
+    for _ in range(256):
+        line = f.readline()
+        if not line:
+            break
+        line = line.strip()
+        m = re.match(rb"^([-+])Y\s+(\d+)\s+([-+])X\s+(\d+)$", line)
+        if m:
+            return ImageHeader(path, int(m.group(4)), int(m.group(2)), 3, 32, "HDR")
+    raise ValueError("HDR resolution line not found")
+
+def _read_cstring(f, limit=256):
+    chars = bytearray()
+    while len(chars) < limit:
+        c = f.read(1)
+        if not c:
+            raise ValueError("Unexpected end of header")
+        if c == b"\0":
+            break
+        chars += c
+    return chars.decode("latin-1")
+
+def _bits_from_mode(img):
+    # The tile rawmode tells the stored depth (e.g. "RGB;16B" for 16-bit PNG opened as RGB)
+    rawmode = img.tile[0][3][0] if img.tile and img.tile[0][3] else ""
+    if not isinstance(rawmode, str):
+        rawmode = ""
+    if ";16" in rawmode or img.mode.startswith("I;16"):
+        return 16
+    if img.mode in ("I", "F") or ";32" in rawmode:
+        return 32
+    return 8
+
+def _read_pil_header(path):
+    if not Image:
+        raise ImportError("PIL not loaded")
+    with Image.open(path) as img:
+        return ImageHeader(path, img.width, img.height, len(img.getbands()), _bits_from_mode(img), img.format or "")
+
+_HEADER_CACHE = {}
+
+def ReadImageHeader(path):
+    """
+    Reads width / height / channels / bit depth from the file header without decoding pixels.
+    Results are cached by (path, size, mtime). Raises OSError / ValueError for unreadable files.
+    """
+    st = os.stat(path)
+    key = (path, st.st_size, st.st_mtime)
+    header = _HEADER_CACHE.get(key)
+    if header is not None:
+        return header
+
+    with open(path, "rb") as f:
+        magic = f.read(8)
+        f.seek(0)
+        if magic.startswith(b"\x89PNG"):
+            header = _read_png_header(f, path)
+        elif magic.startswith(b"\xff\xd8"):
+            header = _read_jpeg_header(f, path)
+        elif magic.startswith(b"\x76\x2f\x31\x01"):
+            header = _read_exr_header(f, path)
+        elif magic.startswith(b"#?"):
+            header = _read_hdr_header(f, path)
+    if header is None:
+        header = _read_pil_header(path)
+
+    _HEADER_CACHE[key] = header
+    return header
+
+# --- Pre-flight Validation ---
+
+def _validate_file(path):
+    problems = []
+    header = None
+    try:
+        if not os.path.isfile(path):
+            problems.append("file not found")
+        elif os.path.getsize(path) == 0:
+            problems.append("empty file (0 bytes)")
+        else:
+            header = ReadImageHeader(path)
+            if header.width <= 0 or header.height <= 0:
+                problems.append(f"invalid resolution {header.resolution_str}")
+                header = None
+    except Exception as e:
+        problems.append(f"unreadable ({e})")
+    return path, header, problems
+
+def ValidateTextureFiles(paths, max_workers=8):
+    """
+    Reads the headers of all candidate files concurrently.
+    Tokenized UDIM paths are expanded and every tile is checked.
+    Returns [(path, header, problems), ...] in input order; header is None for invalid files.
+    """
+    expanded = []
+    for path in paths:
+        files = ExpandTilePath(path) if HasTileToken(path) else [path]
+        expanded.append(files or [path])
+
+    flat = [f for files in expanded for f in files]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        checked = dict((r[0], r) for r in pool.map(_validate_file, flat))
+
+    results = []
+    for path, files in zip(paths, expanded):
+        problems = []
+        header = None
+        for f in files:
+            _, tile_header, tile_problems = checked[f]
+            problems.extend(f"{os.path.basename(f)}: {p}" if f != path else p for p in tile_problems)
+            header = header or tile_header
+        results.append((path, None if problems else header, problems))
+    return results
+
+def GetResolutionMismatch(results):
+    """Returns {resolution_str: [paths]} if the valid files of one texture set have different resolutions, else {}."""
+    by_resolution = {}
+    for path, header, problems in results:
+        if header is not None:
+            by_resolution.setdefault(header.resolution_str, []).append(path)
+    return by_resolution if len(by_resolution) > 1 else {}
+
+def FormatValidationReport(results, mismatches=None, max_lines=20):
+    """Builds a short, human readable report of invalid files and resolution mismatches ("" if all good)."""
+    lines = []
+    for path, header, problems in results:
+        for problem in problems:
+            lines.append(f"- {os.path.basename(path)}: {problem}")
+
+    for resolution_map in (mismatches or []):
+        parts = [f"{res} ({len(files)})" for res, files in sorted(resolution_map.items())]
+        lines.append("- Mixed resolutions in one set (wastes VRAM): " + ", ".join(parts))
+
+    if not lines:
+        return ""
+    if len(lines) > max_lines:
+        lines = lines[:max_lines] + [f"... and {len(lines) - max_lines} more"]
+    return "Texture check found problems:\n" + "\n".join(lines)
+
+# --- Duplicate Detection ---
+
+PARTIAL_HASH_BYTES = 64 * 1024 # read from the start and the end of a file
+
+def _partial_hash(path):
+    h = hashlib.sha1()
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        h.update(f.read(PARTIAL_HASH_BYTES))
+        if size > PARTIAL_HASH_BYTES * 2:
+            f.seek(-PARTIAL_HASH_BYTES, os.SEEK_END)
+            h.update(f.read(PARTIAL_HASH_BYTES))
+    return h.hexdigest()
+
+def _full_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _group_by(paths, key_func, max_workers):
+    """Groups paths by key_func (run on a thread pool); returns only groups with more than one path."""
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        keys = list(pool.map(lambda p: _safe_key(key_func, p), paths))
+    groups = {}
+    for path, key in zip(paths, keys):
+        if key is not None:
+            groups.setdefault(key, []).append(path)
+    return [g for g in groups.values() if len(g) > 1]
+
+def _safe_key(key_func, path):
+    try:
+        return key_func(path)
+    except OSError:
+        return None
+
+def FindDuplicateFiles(paths, max_workers=8):
+    """
+    Finds files with identical content. Files are compared by size first, then by a partial hash
+    (first / last 64 KB), and only files that still collide are fully hashed.
+    Returns a list of groups (lists of paths, input order), one per distinct content.
+    """
+    duplicates = []
+    for same_size in _group_by(paths, os.path.getsize, max_workers):
+        for same_partial in _group_by(same_size, _partial_hash, max_workers):
+            duplicates.extend(_group_by(same_partial, _full_hash, max_workers))
+    return duplicates
+
+def GetDuplicateSavings(groups):
+    """
+    Returns (disk bytes, decoded texture bytes) saved if every group is reduced to a single file.
+    Decoded size comes from the image header (the renderer loads each referenced file separately).
+    """
+    disk = vram = 0
+    for group in groups:
+        extra = len(group) - 1
+        try:
+            disk += os.path.getsize(group[0]) * extra
+            vram += ReadImageHeader(group[0]).decoded_bytes * extra
+        except Exception:
+            pass
+    return disk, vram